@@ -5,6 +5,13 @@ import json
 import base64
 import numpy as np
 
+# Binary STL triangle record: normal, three vertices, attribute byte count (50 bytes, unpadded)
+_STL_RECORD_DTYPE = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attribute", "<u2"),
+])
+
 
 def export_to_format(
     mesh_data: dict,
@@ -22,9 +29,10 @@ def export_to_format(
     Returns:
         Exported file content as bytes
     """
-    vertices = np.array(mesh_data["vertices"])
-    faces = np.array(mesh_data["faces"])
-    normals = np.array(mesh_data.get("normals", []))
+    # Arrays are used as-is (no copy); lists are converted once
+    vertices = np.asarray(mesh_data["vertices"])
+    faces = np.asarray(mesh_data["faces"])
+    normals = np.asarray(mesh_data.get("normals", []))
     
     if format == "stl":
         return _export_stl(vertices, faces, binary)
@@ -54,37 +62,21 @@ def _export_stl_binary(vertices: np.ndarray, faces: np.ndarray) -> bytes:
     """Export to binary STL format."""
     num_triangles = len(faces)
     
-    # Header (80 bytes) + triangle count (4 bytes)
-    header = b'\x00' * 80
-    data = bytearray(header)
-    data.extend(struct.pack('<I', num_triangles))
+    # Triangle corners as a (T, 3, 3) array
+    corner_indices = np.asarray(faces, dtype=np.intp).reshape(-1, 3)
+    triangles = np.asarray(vertices, dtype=np.float64)[corner_indices]
     
-    for face in faces:
-        # Get triangle vertices
-        v0 = vertices[face[0]]
-        v1 = vertices[face[1]]
-        v2 = vertices[face[2]]
-        
-        # Compute face normal
-        edge1 = v1 - v0
-        edge2 = v2 - v0
-        normal = np.cross(edge1, edge2)
-        norm = np.linalg.norm(normal)
-        if norm > 0:
-            normal = normal / norm
-        
-        # Write normal (3 floats)
-        data.extend(struct.pack('<3f', *normal))
-        
-        # Write vertices (9 floats)
-        data.extend(struct.pack('<3f', *v0))
-        data.extend(struct.pack('<3f', *v1))
-        data.extend(struct.pack('<3f', *v2))
-        
-        # Attribute byte count (unused, set to 0)
-        data.extend(struct.pack('<H', 0))
+    # Face normals; degenerate triangles keep a zero normal
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    norms = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, norms, out=normals, where=norms > 0)
+    
+    records = np.zeros(num_triangles, dtype=_STL_RECORD_DTYPE)
+    records["normal"] = normals
+    records["vertices"] = triangles
     
-    return bytes(data)
+    # Header (80 bytes) + triangle count (4 bytes) + 50 bytes per triangle
+    return b'\x00' * 80 + struct.pack('<I', num_triangles) + records.tobytes()
 
 
 def _export_stl_ascii(vertices: np.ndarray, faces: np.ndarray) -> bytes:
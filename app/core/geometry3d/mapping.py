@@ -1,9 +1,13 @@
 """Map 2D pattern points to 3D surfaces."""
 
-from typing import List, Literal, Dict, Any, Optional
+from typing import List, Literal, Dict, Any, Optional, Tuple
 import numpy as np
 
 
+# Vertices processed per block when sampling the RBF displacement field
+_SAMPLE_BLOCK_SIZE = 4096
+
+
 def map_points_to_surface(
     vertices: np.ndarray,
     points_2d: List[dict],
@@ -23,14 +27,15 @@ def map_points_to_surface(
     if not points_2d or len(points_2d) == 0:
         return vertices
 
-    modified = vertices.copy()
     displacement_field = _create_displacement_field(points_2d)
+    displacement = _sample_displacements(displacement_field, vertices[:, :2])
+
+    # Nothing to displace: skip the V x 3 copy entirely
+    if not displacement.any():
+        return vertices
 
-    for i, vertex in enumerate(vertices):
-        x_2d, y_2d = vertex[0], vertex[1]
-        displacement = _sample_displacement(displacement_field, x_2d, y_2d)
-        z_offset = displacement * (1 + curvature)
-        modified[i, 2] += z_offset * 0.1
+    modified = vertices.copy()
+    modified[:, 2] += displacement * (0.1 * (1 + curvature))
 
     return modified
 
@@ -38,7 +43,7 @@ def map_points_to_surface(
 def _create_displacement_field(points_2d: List[dict]) -> dict:
     """Create a displacement field from 2D points."""
     if not points_2d:
-        return {"points": [], "weights": [], "sigma": 0.1}
+        return {"points": [], "weights": [], "sigma": 0.1, "inv_two_sigma_sq": 50.0}
 
     points = np.array([[p["x"], p["y"]] for p in points_2d])
     weights = np.array([p.get("weight", 1.0) for p in points_2d])
@@ -51,50 +56,78 @@ def _create_displacement_field(points_2d: List[dict]) -> dict:
     else:
         sigma = 0.1
 
+    sigma = max(sigma, 0.05)
+
     return {
         "points": points,
         "weights": weights,
-        "sigma": max(sigma, 0.05),
+        "sigma": sigma,
+        "inv_two_sigma_sq": 1.0 / (2.0 * sigma * sigma),
     }
 
 
-def _sample_displacement(field: dict, x: float, y: float) -> float:
-    """Sample displacement at a 2D location using RBF interpolation."""
+def _sample_displacements(field: dict, queries: np.ndarray) -> np.ndarray:
+    """Sample displacement at many 2D locations at once using RBF interpolation."""
     points = field["points"]
     weights = field["weights"]
-    sigma = field["sigma"]
+    inv_two_sigma_sq = field["inv_two_sigma_sq"]
 
     if len(points) == 0:
-        return 0.0
+        return np.zeros(len(queries))
+
+    displacement = np.zeros(len(queries))
+
+    # Work in vertex blocks so each (block x P) kernel matrix stays cache-resident
+    for start in range(0, len(queries), _SAMPLE_BLOCK_SIZE):
+        stop = start + _SAMPLE_BLOCK_SIZE
+        gaussians = _sqeuclidean_cdist(queries[start:stop], points)
+        gaussians *= -inv_two_sigma_sq
+        np.exp(gaussians, out=gaussians)
+
+        total_weight = gaussians.sum(axis=1)
+        total_value = gaussians @ weights
+
+        np.divide(
+            total_value,
+            total_weight,
+            out=displacement[start:stop],
+            where=total_weight > 0,
+        )
+
+    return displacement
+
+
+def _points_to_xy(points_2d: List[dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Split a list of 2D point dicts into x and y coordinate arrays."""
+    x = np.fromiter((p["x"] for p in points_2d), dtype=np.float64, count=len(points_2d))
+    y = np.fromiter((p["y"] for p in points_2d), dtype=np.float64, count=len(points_2d))
+    return x, y
 
-    query = np.array([x, y])
-    total_weight = 0.0
-    total_value = 0.0
 
-    for point, weight in zip(points, weights):
-        distance_sq = np.sum((query - point) ** 2)
-        gaussian = np.exp(-distance_sq / (2 * sigma**2))
-        total_weight += gaussian
-        total_value += gaussian * weight
+def _sqeuclidean_cdist(queries: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Pairwise squared Euclidean distances between query and field points."""
+    from scipy.spatial.distance import cdist
 
-    if total_weight > 0:
-        return total_value / total_weight
-    return 0.0
+    return cdist(queries, points, "sqeuclidean")
 
 
 def project_pattern_to_sphere(
     points_2d: List[dict],
     radius: float = 1.0,
-) -> List[tuple]:
-    """Project 2D pattern points onto a sphere surface."""
-    points_3d = []
-    for p in points_2d:
-        x, y = p["x"], p["y"]
-        denom = 1 + x**2 + y**2
-        x3d = 2 * x / denom
-        y3d = 2 * y / denom
-        z3d = (x**2 + y**2 - 1) / denom
-        points_3d.append((x3d * radius, y3d * radius, z3d * radius))
+) -> np.ndarray:
+    """Project 2D pattern points onto a sphere surface.
+
+    Returns:
+        Nx3 array of projected points
+    """
+    x, y = _points_to_xy(points_2d)
+    r_sq = x**2 + y**2
+    scale = radius / (1 + r_sq)
+
+    points_3d = np.empty((len(x), 3))
+    points_3d[:, 0] = 2 * x * scale
+    points_3d[:, 1] = 2 * y * scale
+    points_3d[:, 2] = (r_sq - 1) * scale
     return points_3d
 
 
@@ -102,16 +135,21 @@ def project_pattern_to_torus(
     points_2d: List[dict],
     major_radius: float = 1.0,
     minor_radius: float = 0.3,
-) -> List[tuple]:
-    """Project 2D pattern points onto a torus surface."""
-    points_3d = []
-    for p in points_2d:
-        theta = (p["x"] + 1) * np.pi
-        phi = (p["y"] + 1) * np.pi
-        x3d = (major_radius + minor_radius * np.cos(phi)) * np.cos(theta)
-        y3d = (major_radius + minor_radius * np.cos(phi)) * np.sin(theta)
-        z3d = minor_radius * np.sin(phi)
-        points_3d.append((x3d, y3d, z3d))
+) -> np.ndarray:
+    """Project 2D pattern points onto a torus surface.
+
+    Returns:
+        Nx3 array of projected points
+    """
+    x, y = _points_to_xy(points_2d)
+    theta = (x + 1) * np.pi
+    phi = (y + 1) * np.pi
+    ring = major_radius + minor_radius * np.cos(phi)
+
+    points_3d = np.empty((len(x), 3))
+    points_3d[:, 0] = ring * np.cos(theta)
+    points_3d[:, 1] = ring * np.sin(theta)
+    points_3d[:, 2] = minor_radius * np.sin(phi)
     return points_3d
 
 
@@ -119,16 +157,19 @@ def project_pattern_to_cylinder(
     points_2d: List[dict],
     radius: float = 1.0,
     height: float = 2.0,
-) -> List[tuple]:
-    """Project 2D pattern points onto a cylinder surface."""
-    points_3d = []
-    for p in points_2d:
-        theta = (p["x"] + 1) * np.pi
-        z = p["y"] * height / 2
-        x3d = radius * np.cos(theta)
-        y3d = radius * np.sin(theta)
-        z3d = z
-        points_3d.append((x3d, y3d, z3d))
+) -> np.ndarray:
+    """Project 2D pattern points onto a cylinder surface.
+
+    Returns:
+        Nx3 array of projected points
+    """
+    x, y = _points_to_xy(points_2d)
+    theta = (x + 1) * np.pi
+
+    points_3d = np.empty((len(x), 3))
+    points_3d[:, 0] = radius * np.cos(theta)
+    points_3d[:, 1] = radius * np.sin(theta)
+    points_3d[:, 2] = y * height / 2
     return points_3d
 
 
@@ -192,13 +233,12 @@ def map_image_to_3d(
 
     # Resize Grid
     if displacement_grid.shape[0] != resolution or displacement_grid.shape[1] != resolution:
-        from scipy.ndimage import zoom
-
-        zoom_factors = (
-            resolution / displacement_grid.shape[0],
-            resolution / displacement_grid.shape[1],
+        # cv2.resize takes (width, height)
+        displacement_grid = cv2.resize(
+            displacement_grid.astype(np.float32, copy=False),
+            (resolution, resolution),
+            interpolation=cv2.INTER_LINEAR,
         )
-        displacement_grid = zoom(displacement_grid, zoom_factors, order=1)
 
     # Apply smoothing
     if smoothing_method == "gaussian":
@@ -1,9 +1,34 @@
 """3D primitive shape generators."""
 
+import math
+
 import numpy as np
 from typing import Tuple
 
 
+# Golden ratio for icosahedron
+_PHI = (1 + math.sqrt(5)) / 2
+
+# Icosahedron vertices, normalized to the unit sphere
+_ICOSA_VERTS = np.array([
+    [-1, _PHI, 0], [1, _PHI, 0], [-1, -_PHI, 0], [1, -_PHI, 0],
+    [0, -1, _PHI], [0, 1, _PHI], [0, -1, -_PHI], [0, 1, -_PHI],
+    [_PHI, 0, -1], [_PHI, 0, 1], [-_PHI, 0, -1], [-_PHI, 0, 1],
+], dtype=np.float64)
+# Every base vertex is a permutation of (0, ±1, ±phi), so all share |v| = sqrt(1 + phi^2)
+_ICOSA_VERTS *= 1.0 / math.sqrt(1 + _PHI * _PHI)
+_ICOSA_VERTS.flags.writeable = False
+
+# Icosahedron faces
+_ICOSA_FACES = np.array([
+    [0, 11, 5], [0, 5, 1], [0, 1, 7], [0, 7, 10], [0, 10, 11],
+    [1, 5, 9], [5, 11, 4], [11, 10, 2], [10, 7, 6], [7, 1, 8],
+    [3, 9, 4], [3, 4, 2], [3, 2, 6], [3, 6, 8], [3, 8, 9],
+    [4, 9, 5], [2, 4, 11], [6, 2, 10], [8, 6, 7], [9, 8, 1],
+])
+_ICOSA_FACES.flags.writeable = False
+
+
 def create_sphere(
     radius: float = 1.0,
     subdivisions: int = 2,
@@ -22,26 +47,8 @@ def create_sphere(
     Returns:
         Tuple of (vertices, faces, normals)
     """
-    # Golden ratio for icosahedron
-    phi = (1 + np.sqrt(5)) / 2
-    
-    # Icosahedron vertices
-    vertices = np.array([
-        [-1, phi, 0], [1, phi, 0], [-1, -phi, 0], [1, -phi, 0],
-        [0, -1, phi], [0, 1, phi], [0, -1, -phi], [0, 1, -phi],
-        [phi, 0, -1], [phi, 0, 1], [-phi, 0, -1], [-phi, 0, 1],
-    ], dtype=np.float64)
-    
-    # Normalize to unit sphere
-    vertices = vertices / np.linalg.norm(vertices[0])
-    
-    # Icosahedron faces
-    faces = np.array([
-        [0, 11, 5], [0, 5, 1], [0, 1, 7], [0, 7, 10], [0, 10, 11],
-        [1, 5, 9], [5, 11, 4], [11, 10, 2], [10, 7, 6], [7, 1, 8],
-        [3, 9, 4], [3, 4, 2], [3, 2, 6], [3, 6, 8], [3, 8, 9],
-        [4, 9, 5], [2, 4, 11], [6, 2, 10], [8, 6, 7], [9, 8, 1],
-    ])
+    vertices = _ICOSA_VERTS
+    faces = _ICOSA_FACES.copy()
     
     # Subdivide
     for _ in range(subdivisions):
@@ -3,11 +3,18 @@
 import numpy as np
 from typing import Tuple
 
+from app.core.jit import HAS_NUMBA, njit
+
+if HAS_NUMBA:
+    from numba import types
+    from numba.typed import Dict
+
 
 def apply_extrusion(
     vertices: np.ndarray,
     normals: np.ndarray,
     depth: float,
+    out: np.ndarray | None = None,
 ) -> np.ndarray:
     """
     Apply extrusion by displacing vertices along their normals.
@@ -16,13 +23,23 @@ def apply_extrusion(
         vertices: Mesh vertices
         normals: Vertex normals
         depth: Extrusion depth (multiplier)
+        out: Optional preallocated array (same shape as vertices) to write
+            the result into; may be ``vertices`` itself
     
     Returns:
-        Modified vertices
+        Modified vertices (``out`` when given)
     """
     # Depth of 1.0 means no change
     offset = (depth - 1.0) * 0.5
-    return vertices + normals * offset
+    if out is None:
+        return vertices + normals * offset
+    
+    if np.shares_memory(out, vertices):
+        out += normals * offset
+    else:
+        np.multiply(normals, offset, out=out)
+        out += vertices
+    return out
 
 
 def apply_subdivision(
@@ -57,6 +74,12 @@ def _subdivide_once(
     faces: np.ndarray,
 ) -> Tuple[np.ndarray, np.ndarray]:
     """Perform one iteration of subdivision."""
+    if HAS_NUMBA:
+        return _subdivide_once_jit(
+            np.ascontiguousarray(vertices, dtype=np.float64),
+            np.ascontiguousarray(faces, dtype=np.int64),
+        )
+    
     edge_midpoints = {}
     new_vertices = list(vertices)
     new_faces = []
@@ -90,6 +113,53 @@ def _subdivide_once(
     return np.array(new_vertices), np.array(new_faces)
 
 
+@njit(cache=True)
+def _subdivide_once_jit(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Numba kernel for :func:`_subdivide_once` (same vertex and face order)."""
+    num_vertices = vertices.shape[0]
+    num_faces = faces.shape[0]
+    
+    # Upper bounds: one midpoint per face edge, four faces per face
+    new_vertices = np.empty((num_vertices + 3 * num_faces, 3))
+    new_vertices[:num_vertices] = vertices
+    new_faces = np.empty((4 * num_faces, 3), dtype=np.int64)
+    
+    # Edge (lo, hi) packed into a single int64 key
+    edge_midpoints = Dict.empty(key_type=types.int64, value_type=types.int64)
+    key_stride = np.int64(num_vertices) << 1
+    vertex_count = num_vertices
+    midpoints = np.empty(3, dtype=np.int64)
+    
+    for f in range(num_faces):
+        for e in range(3):
+            i1 = faces[f, e]
+            i2 = faces[f, (e + 1) % 3]
+            key = min(i1, i2) * key_stride + max(i1, i2)
+            idx = edge_midpoints.get(key, np.int64(-1))
+            if idx < 0:
+                idx = vertex_count
+                for k in range(3):
+                    new_vertices[idx, k] = (vertices[i1, k] + vertices[i2, k]) / 2
+                edge_midpoints[key] = idx
+                vertex_count += 1
+            midpoints[e] = idx
+        
+        v0, v1, v2 = faces[f, 0], faces[f, 1], faces[f, 2]
+        a, b, c = midpoints[0], midpoints[1], midpoints[2]
+        
+        # Create 4 new triangles
+        base = 4 * f
+        new_faces[base, 0], new_faces[base, 1], new_faces[base, 2] = v0, a, c
+        new_faces[base + 1, 0], new_faces[base + 1, 1], new_faces[base + 1, 2] = a, v1, b
+        new_faces[base + 2, 0], new_faces[base + 2, 1], new_faces[base + 2, 2] = c, b, v2
+        new_faces[base + 3, 0], new_faces[base + 3, 1], new_faces[base + 3, 2] = a, b, c
+    
+    return new_vertices[:vertex_count].copy(), new_faces
+
+
 def apply_smoothing(
     vertices: np.ndarray,
     faces: np.ndarray,
@@ -108,24 +178,31 @@ def apply_smoothing(
     Returns:
         Smoothed vertices
     """
-    # Build adjacency information
-    adjacency = _build_adjacency(vertices, faces)
+    # Build adjacency information (CSR: neighbors of i are indices[indptr[i]:indptr[i + 1]])
+    indptr, indices = _build_adjacency(vertices, faces)
+    
+    counts = np.diff(indptr)
+    
+    # Isolated vertices keep their position; reduceat only sees non-empty rows,
+    # whose CSR segments are contiguous once the empty ones are dropped
+    has_neighbors = counts > 0
+    starts = indptr[:-1][has_neighbors]
+    inv_counts = 1.0 / counts[has_neighbors, None]
     
     smoothed = vertices.copy()
     
+    if len(starts) == 0:
+        return smoothed
+    
     for _ in range(iterations):
-        new_positions = np.zeros_like(smoothed)
+        # Compute average of neighbors
+        neighbor_avg = np.add.reduceat(smoothed[indices], starts, axis=0) * inv_counts
         
-        for i, neighbors in enumerate(adjacency):
-            if not neighbors:
-                new_positions[i] = smoothed[i]
-                continue
-            
-            # Compute average of neighbors
-            neighbor_avg = np.mean(smoothed[list(neighbors)], axis=0)
-            
-            # Blend between current position and neighbor average
-            new_positions[i] = (1 - factor) * smoothed[i] + factor * neighbor_avg
+        # Blend between current position and neighbor average
+        new_positions = smoothed.copy()
+        new_positions[has_neighbors] = (
+            (1 - factor) * smoothed[has_neighbors] + factor * neighbor_avg
+        )
         
         smoothed = new_positions
     
@@ -135,18 +212,29 @@ def apply_smoothing(
 def _build_adjacency(
     vertices: np.ndarray,
     faces: np.ndarray,
-) -> list[set]:
-    """Build vertex adjacency list from faces."""
-    adjacency = [set() for _ in range(len(vertices))]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build vertex adjacency from faces in CSR form.
     
-    for face in faces:
-        for i in range(3):
-            v = face[i]
-            for j in range(3):
-                if i != j:
-                    adjacency[v].add(face[j])
+    Returns:
+        Tuple of (indptr, indices): the sorted, unique neighbors of vertex i
+        are indices[indptr[i]:indptr[i + 1]]
+    """
+    num_vertices = len(vertices)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    
+    # Every ordered pair of distinct corners within a face is a directed edge
+    src = faces[:, [0, 1, 2, 1, 2, 0]].ravel()
+    dst = faces[:, [1, 2, 0, 0, 1, 2]].ravel()
+    
+    # Pack (src, dst) into one key so np.unique both dedupes and sorts by source
+    keys = np.unique(src * num_vertices + dst)
+    sources = keys // num_vertices
+    indices = keys % num_vertices
+    
+    indptr = np.searchsorted(sources, np.arange(num_vertices + 1))
     
-    return adjacency
+    return indptr, indices
 
 
 def apply_twist(
@@ -170,26 +258,23 @@ def apply_twist(
     axis_idx = {"x": 0, "y": 1, "z": 2}[axis]
     other_axes = [i for i in range(3) if i != axis_idx]
     
-# Compute axis center to make twist noticeable for centered meshes
+    # Compute axis center to make twist noticeable for centered meshes
     axis_values = vertices[:, axis_idx]
     axis_min = axis_values.min()
     axis_max = axis_values.max()
     axis_center = (axis_min + axis_max) / 2.0
 
-    for i, vertex in enumerate(vertices):
-        # Distance along twist axis determines rotation relative to center
-        dist = vertex[axis_idx] - axis_center
-        angle = dist * angle_per_unit
-        
-        # Rotate in the plane perpendicular to axis
-        cos_a = np.cos(angle)
-        sin_a = np.sin(angle)
-        
-        x = vertex[other_axes[0]]
-        y = vertex[other_axes[1]]
-        
-        twisted[i, other_axes[0]] = x * cos_a - y * sin_a
-        twisted[i, other_axes[1]] = x * sin_a + y * cos_a
+    # Distance along twist axis determines rotation relative to center
+    angles = (axis_values - axis_center) * angle_per_unit
+    cos_a = np.cos(angles)
+    sin_a = np.sin(angles)
+    
+    # Rotate in the plane perpendicular to axis
+    x = vertices[:, other_axes[0]]
+    y = vertices[:, other_axes[1]]
+    
+    twisted[:, other_axes[0]] = x * cos_a - y * sin_a
+    twisted[:, other_axes[1]] = x * sin_a + y * cos_a
     
     return twisted
 
@@ -226,16 +311,14 @@ def apply_taper(
     if axis_range == 0:
         return vertices
     
-    for i, vertex in enumerate(vertices):
-        # Interpolation factor (0 at min, 1 at max)
-        t = (vertex[axis_idx] - axis_min) / axis_range
-        
-        # Scale factor
-        scale = start_scale + t * (end_scale - start_scale)
-        
-        # Scale perpendicular components
-        for ax in other_axes:
-            tapered[i, ax] = vertex[ax] * scale
+    # Interpolation factor (0 at min, 1 at max)
+    t = (axis_values - axis_min) / axis_range
+    
+    # Scale factor
+    scale = start_scale + t * (end_scale - start_scale)
+    
+    # Scale perpendicular components
+    tapered[:, other_axes] = vertices[:, other_axes] * scale[:, None]
     
     return tapered
 
@@ -260,7 +343,8 @@ def apply_bend(
     """
     bent = vertices.copy()
     
-    axis_idx = {"x": 0, "y": 1, "z": 2}[axis]
+    # (perpendicular axis that bows out, bend axis)
+    perp_idx, axis_idx = {"x": (1, 0), "y": (0, 1), "z": (0, 2)}[axis]
     
     # Get axis range
     axis_values = vertices[:, axis_idx]
@@ -274,29 +358,15 @@ def apply_bend(
     # Bending radius
     radius = axis_range / bend_angle
     
-    for i, vertex in enumerate(vertices):
-        # Position along bend axis (0 to 1)
-        t = (vertex[axis_idx] - axis_min) / axis_range
-        
-        # Current angle
-        angle = t * bend_angle
-        
-        # New position
-        # Bend primarily affects the axis and one perpendicular
-        if axis == "z":
-            x = vertex[0] + radius * (np.cos(angle) - 1)
-            z = axis_min + radius * np.sin(angle)
-            bent[i, 0] = x
-            bent[i, 2] = z
-        elif axis == "y":
-            x = vertex[0] + radius * (np.cos(angle) - 1)
-            y = axis_min + radius * np.sin(angle)
-            bent[i, 0] = x
-            bent[i, 1] = y
-        else:  # x
-            y = vertex[1] + radius * (np.cos(angle) - 1)
-            x = axis_min + radius * np.sin(angle)
-            bent[i, 1] = y
-            bent[i, 0] = x
+    # Position along bend axis (0 to 1)
+    t = (axis_values - axis_min) / axis_range
+    
+    # Current angle
+    angle = t * bend_angle
+    
+    # New position
+    # Bend primarily affects the axis and one perpendicular
+    bent[:, perp_idx] = vertices[:, perp_idx] + radius * (np.cos(angle) - 1)
+    bent[:, axis_idx] = axis_min + radius * np.sin(angle)
     
     return bent
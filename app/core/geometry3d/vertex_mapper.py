@@ -4,10 +4,15 @@ Maps 2D image pixel data directly to 3D mesh vertex Z-heights,
 creating relief surfaces from crop circle patterns.
 """
 
+from functools import lru_cache
+
+import cv2
 import numpy as np
 from scipy import ndimage
 from typing import Literal
 
+from app.core.jit import HAS_NUMBA, njit, prange
+
 
 def create_mesh_grid(
     resolution: int = 128,
@@ -27,38 +32,57 @@ def create_mesh_grid(
     """
     half_size = size / 2
 
-    # Create grid of x, y coordinates
-    x = np.linspace(-half_size, half_size, resolution)
-    y = np.linspace(-half_size, half_size, resolution)
-    xx, yy = np.meshgrid(x, y)
-
-    # Initialize z to 0 (flat plane)
-    zz = np.zeros_like(xx)
-
-    # Flatten to vertex list
-    vertices = np.column_stack(
-        [
-            xx.flatten(),
-            yy.flatten(),
-            zz.flatten(),
-        ]
-    )
+    # Grid of x, y coordinates, broadcast straight into the vertex buffer
+    # (row-major: x varies along a row, y down the rows; z = 0 for a flat plane)
+    coords = np.linspace(-half_size, half_size, resolution)
+    vertices = np.zeros((resolution * resolution, 3))
+    grid = vertices.reshape(resolution, resolution, 3)
+    grid[:, :, 0] = coords[np.newaxis, :]
+    grid[:, :, 1] = coords[:, np.newaxis]
+
+    # Generate triangle faces: top-left vertex index of each grid cell (open
+    # grids of row i and column j broadcast to every cell)
+    cells = np.arange(max(resolution - 1, 0), dtype=np.int32)
+    v0 = cells[:, np.newaxis] * resolution + cells[np.newaxis, :]
+
+    # Two triangles per grid cell: (v0, v2, v1) and (v1, v2, v3), written
+    # straight into the int32 face buffer (v1 = v0 + 1, v2 = v0 + resolution)
+    faces = np.empty(v0.shape + (6,), dtype=np.int32)
+    faces[..., 0] = v0
+    faces[..., 1] = v0 + resolution
+    faces[..., 2] = v0 + 1
+    faces[..., 3] = faces[..., 2]
+    faces[..., 4] = faces[..., 1]
+    faces[..., 5] = faces[..., 1] + 1
+
+    return vertices, faces.reshape(-1, 3)
+
+
+@lru_cache(maxsize=8)
+def _mesh_grid_cached(resolution: int, size: float) -> tuple[np.ndarray, np.ndarray]:
+    """Cached, read-only :func:`create_mesh_grid` result for repeated resolutions.
+
+    Callers must copy either array before handing it out or mutating it.
+    """
+    vertices, faces = create_mesh_grid(resolution=resolution, size=size)
+    vertices.flags.writeable = False
+    faces.flags.writeable = False
+    return vertices, faces
 
-    # Generate triangle faces
-    faces = []
-    for i in range(resolution - 1):
-        for j in range(resolution - 1):
-            # Vertex indices in the grid
-            v0 = i * resolution + j
-            v1 = v0 + 1
-            v2 = (i + 1) * resolution + j
-            v3 = v2 + 1
 
-            # Two triangles per grid cell
-            faces.append([v0, v2, v1])
-            faces.append([v1, v2, v3])
+@lru_cache(maxsize=8)
+def _grid_sample_indices(resolution: int) -> np.ndarray:
+    """Flat displacement-grid index sampled by each base mesh vertex (read-only).
 
-    return vertices, np.array(faces, dtype=np.int32)
+    Same lookup as :func:`map_pixels_to_vertices` for the cached size-2.0
+    mesh and a (resolution, resolution) displacement grid.
+    """
+    vertices, _ = _mesh_grid_cached(resolution, 2.0)
+    grid_x = np.clip(_grid_indices(vertices[:, 0], resolution), 0, resolution - 1)
+    grid_y = np.clip(_grid_indices(vertices[:, 1], resolution), 0, resolution - 1)
+    indices = grid_y * resolution + grid_x
+    indices.flags.writeable = False
+    return indices
 
 
 def map_pixels_to_vertices(
@@ -66,6 +90,7 @@ def map_pixels_to_vertices(
     displacement_grid: np.ndarray,
     amplitude: float = 1.0,
     base_height: float = 0.0,
+    inplace: bool = False,
 ) -> np.ndarray:
     """
     Map pixel displacement values to mesh vertex Z-heights.
@@ -77,36 +102,44 @@ def map_pixels_to_vertices(
         displacement_grid: 2D grid of displacement values [0, 1]
         amplitude: Maximum Z-height for "hit" pixels
         base_height: Z-height for "miss" pixels
+        inplace: If True, write Z into `vertices` instead of a copy
 
     Returns:
         Modified vertices with Z-displacement applied
     """
-    modified = vertices.copy()
+    modified = vertices if inplace else vertices.copy()
     grid_height, grid_width = displacement_grid.shape
 
-    for i, vertex in enumerate(vertices):
-        vx, vy = vertex[0], vertex[1]
-
-        # Map vertex coordinates [-1, 1] to grid indices [0, size-1]
-        # Assuming vertex coords are normalized to [-1, 1]
-        grid_x = int((vx + 1) / 2 * (grid_width - 1))
-        grid_y = int((vy + 1) / 2 * (grid_height - 1))
+    # Map vertex coordinates [-1, 1] to grid indices [0, size-1]
+    # Assuming vertex coords are normalized to [-1, 1]
+    grid_x = _grid_indices(vertices[:, 0], grid_width)
+    grid_y = _grid_indices(vertices[:, 1], grid_height)
 
-        # Clamp to grid bounds
-        grid_x = np.clip(grid_x, 0, grid_width - 1)
-        grid_y = np.clip(grid_y, 0, grid_height - 1)
+    # Clamp to grid bounds
+    np.clip(grid_x, 0, grid_width - 1, out=grid_x)
+    np.clip(grid_y, 0, grid_height - 1, out=grid_y)
 
-        # Sample displacement and apply
-        displacement = displacement_grid[grid_y, grid_x]
-        modified[i, 2] = base_height + displacement * amplitude
+    # Sample displacement and apply; the offset is added straight into the
+    # Z column instead of through another temporary
+    displacement = np.multiply(displacement_grid[grid_y, grid_x], amplitude)
+    np.add(displacement, base_height, out=modified[:, 2])
 
     return modified
 
 
+def _grid_indices(coords: np.ndarray, size: int) -> np.ndarray:
+    """Truncated grid indices ((coords + 1) / 2 * (size - 1)), using one temporary."""
+    scaled = np.add(coords, 1)
+    scaled /= 2
+    scaled *= size - 1
+    return scaled.astype(np.intp)
+
+
 def apply_gaussian_smoothing(
     vertices: np.ndarray,
     resolution: int,
     sigma: float = 2.0,
+    inplace: bool = False,
 ) -> np.ndarray:
     """
     Apply Gaussian blur to vertex Z-heights for smooth curves.
@@ -115,22 +148,38 @@ def apply_gaussian_smoothing(
         vertices: Nx3 array of mesh vertices
         resolution: Original grid resolution (to reshape Z values)
         sigma: Gaussian blur sigma (larger = smoother)
+        inplace: If True, write Z into `vertices` instead of a copy
 
     Returns:
         Vertices with smoothed Z-heights
     """
-    modified = vertices.copy()
+    modified = vertices if inplace else vertices.copy()
 
-    # Extract Z values and reshape to grid
-    z_values = modified[:, 2].reshape(resolution, resolution)
+    # Smooth the Z column as a (resolution, resolution) grid and write it back
+    # through the column, so in-place smoothing works for any array layout
+    z_grid = modified[:, 2].reshape(resolution, resolution)
+    modified[:, 2] = _gaussian_smooth_grid(z_grid, sigma).reshape(-1)
 
-    # Apply Gaussian blur
-    smoothed_z = ndimage.gaussian_filter(z_values, sigma=sigma)
+    return modified
 
-    # Update vertices
-    modified[:, 2] = smoothed_z.flatten()
 
-    return modified
+def _gaussian_smooth_grid(z_grid: np.ndarray, sigma: float) -> np.ndarray:
+    """Gaussian-blurred copy of a Z grid, same as ``ndimage.gaussian_filter`` defaults.
+
+    Float grids go through OpenCV's separable (vectorized) Gaussian with the
+    same kernel radius (truncate=4.0) and mirrored border as ndimage.
+    """
+    if z_grid.dtype not in (np.float32, np.float64):
+        return ndimage.gaussian_filter(z_grid, sigma=sigma)
+
+    ksize = 2 * int(4.0 * sigma + 0.5) + 1
+    return cv2.GaussianBlur(
+        np.ascontiguousarray(z_grid),
+        (ksize, ksize),
+        sigmaX=sigma,
+        sigmaY=sigma,
+        borderType=cv2.BORDER_REFLECT,
+    )
 
 
 def apply_bilinear_interpolation(
@@ -152,22 +201,62 @@ def apply_bilinear_interpolation(
         Vertices with smoothed Z-heights
     """
     modified = vertices.copy()
+    modified[:, 2] = _bilinear_smooth_grid(
+        modified[:, 2].reshape(resolution, resolution), iterations
+    ).ravel()
+
+    return modified
+
+
+# 5-point stencil (a vertex plus its 4 neighbors) for the bilinear smoothing pass
+_CROSS_KERNEL = np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0]], dtype=np.float64)
+
+
+def _bilinear_smooth_grid(z_grid: np.ndarray, iterations: int) -> np.ndarray:
+    """Run the bilinear smoothing passes over a (resolution, resolution) Z grid into a new grid."""
+    if HAS_NUMBA:
+        return _bilinear_smooth_jit(np.ascontiguousarray(z_grid), iterations)
+
+    z_grid = z_grid.copy()
+    if z_grid.dtype in (np.float32, np.float64):
+        # Sum each vertex and its 4 neighbors in one vectorized OpenCV pass;
+        # only the interior is written back, so the border stays fixed
+        for _ in range(iterations):
+            summed = cv2.filter2D(z_grid, -1, _CROSS_KERNEL, borderType=cv2.BORDER_REFLECT)
+            np.divide(summed[1:-1, 1:-1], 5.0, out=z_grid[1:-1, 1:-1])
+        return z_grid
 
     for _ in range(iterations):
-        z_grid = modified[:, 2].reshape(resolution, resolution)
         smoothed = z_grid.copy()
 
         # Average each interior vertex with its 4 neighbors
-        for i in range(1, resolution - 1):
-            for j in range(1, resolution - 1):
-                neighbors = (
-                    z_grid[i - 1, j] + z_grid[i + 1, j] + z_grid[i, j - 1] + z_grid[i, j + 1]
-                )
-                smoothed[i, j] = (z_grid[i, j] + neighbors) / 5.0
+        smoothed[1:-1, 1:-1] = (
+            z_grid[1:-1, 1:-1]
+            + (z_grid[:-2, 1:-1] + z_grid[2:, 1:-1] + z_grid[1:-1, :-2] + z_grid[1:-1, 2:])
+        ) / 5.0
 
-        modified[:, 2] = smoothed.flatten()
+        z_grid = smoothed
 
-    return modified
+    return z_grid
+
+
+@njit(parallel=True, cache=True)
+def _bilinear_smooth_jit(z: np.ndarray, iterations: int) -> np.ndarray:
+    """Run all bilinear smoothing passes over a Z grid, ping-ponging two buffers."""
+    rows, cols = z.shape
+    src = z.copy()
+    dst = z.copy()  # Border values never change, so both buffers share them
+
+    for _ in range(iterations):
+        for i in prange(1, rows - 1):
+            for j in range(1, cols - 1):
+                dst[i, j] = (
+                    src[i, j]
+                    + (src[i - 1, j] + src[i + 1, j] + src[i, j - 1] + src[i, j + 1])
+                ) / 5.0
+        src, dst = dst, src
+
+    return src
 
 
 def compute_vertex_normals(
@@ -184,23 +273,33 @@ def compute_vertex_normals(
     Returns:
         Nx3 array of normalized vertex normals
     """
-    normals = np.zeros_like(vertices)
+    if HAS_NUMBA and vertices.dtype.kind == "f" and len(faces) > 0:
+        return _vertex_normals_jit(
+            np.ascontiguousarray(vertices),
+            np.ascontiguousarray(faces, dtype=np.int64),
+        )
+
+    num_vertices = len(vertices)
+    faces = np.asarray(faces, dtype=np.intp).reshape(-1, 3)
 
-    # Compute face normals and accumulate at vertices
-    for face in faces:
-        v0, v1, v2 = vertices[face[0]], vertices[face[1]], vertices[face[2]]
+    # Compute face normals for all triangles at once
+    triangles = vertices[faces]
 
-        # Edge vectors
-        e1 = v1 - v0
-        e2 = v2 - v0
+    # Edge vectors
+    e1 = triangles[:, 1] - triangles[:, 0]
+    e2 = triangles[:, 2] - triangles[:, 0]
 
-        # Face normal (cross product)
-        face_normal = np.cross(e1, e2)
+    # Face normal (cross product)
+    face_normals = np.cross(e1, e2)
 
-        # Accumulate at each vertex
-        normals[face[0]] += face_normal
-        normals[face[1]] += face_normal
-        normals[face[2]] += face_normal
+    # Accumulate at each vertex with one weighted bincount per axis; corners
+    # are listed corner-major (all first corners, then second, then third),
+    # the same summation order as scattering one corner at a time
+    corners = faces.T.ravel()
+    normals = np.column_stack([
+        np.bincount(corners, weights=np.tile(face_normals[:, axis], 3), minlength=num_vertices)
+        for axis in range(3)
+    ]).astype(vertices.dtype, copy=False)
 
     # Normalize
     lengths = np.linalg.norm(normals, axis=1, keepdims=True)
@@ -210,6 +309,52 @@ def compute_vertex_normals(
     return normals
 
 
+@njit(parallel=True, cache=True)
+def _vertex_normals_jit(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Area-weighted vertex normals, accumulated into per-axis (SoA) buffers."""
+    num_faces = faces.shape[0]
+    num_vertices = vertices.shape[0]
+
+    # Face normals: independent per face, so compute them in parallel
+    face_x = np.empty(num_faces, dtype=vertices.dtype)
+    face_y = np.empty(num_faces, dtype=vertices.dtype)
+    face_z = np.empty(num_faces, dtype=vertices.dtype)
+    for f in prange(num_faces):
+        a, b, c = faces[f, 0], faces[f, 1], faces[f, 2]
+        e1x = vertices[b, 0] - vertices[a, 0]
+        e1y = vertices[b, 1] - vertices[a, 1]
+        e1z = vertices[b, 2] - vertices[a, 2]
+        e2x = vertices[c, 0] - vertices[a, 0]
+        e2y = vertices[c, 1] - vertices[a, 1]
+        e2z = vertices[c, 2] - vertices[a, 2]
+        face_x[f] = e1y * e2z - e1z * e2y
+        face_y[f] = e1z * e2x - e1x * e2z
+        face_z[f] = e1x * e2y - e1y * e2x
+
+    # Scatter to vertices serially (shared vertices would race), one corner
+    # at a time to keep the same summation order as the NumPy path
+    sum_x = np.zeros(num_vertices, dtype=vertices.dtype)
+    sum_y = np.zeros(num_vertices, dtype=vertices.dtype)
+    sum_z = np.zeros(num_vertices, dtype=vertices.dtype)
+    for corner in range(3):
+        for f in range(num_faces):
+            v = faces[f, corner]
+            sum_x[v] += face_x[f]
+            sum_y[v] += face_y[f]
+            sum_z[v] += face_z[f]
+
+    normals = np.empty((num_vertices, 3), dtype=vertices.dtype)
+    for v in prange(num_vertices):
+        length = np.sqrt(sum_x[v] * sum_x[v] + sum_y[v] * sum_y[v] + sum_z[v] * sum_z[v])
+        if length == 0:
+            length = 1.0
+        normals[v, 0] = sum_x[v] / length
+        normals[v, 1] = sum_y[v] / length
+        normals[v, 2] = sum_z[v] / length
+
+    return normals
+
+
 def generate_relief_mesh(
     displacement_grid: np.ndarray,
     resolution: int = 128,
@@ -230,8 +375,8 @@ def generate_relief_mesh(
     Returns:
         Dict with 'vertices', 'faces', 'normals'
     """
-    # Create base mesh
-    vertices, faces = create_mesh_grid(resolution=resolution)
+    # Create base mesh (shared with the cache; only the heights are new)
+    base_vertices, faces = _mesh_grid_cached(resolution, 2.0)
 
     # Resize displacement grid to match mesh resolution
     from scipy.ndimage import zoom
@@ -243,22 +388,29 @@ def generate_relief_mesh(
         )
         displacement_grid = zoom(displacement_grid, zoom_factors, order=1)
 
-    # Apply displacement
-    vertices = map_pixels_to_vertices(vertices, displacement_grid, amplitude=amplitude)
+    # Displace and smooth the heights as one contiguous (resolution, resolution)
+    # grid; x and y never change, so (N, 3) vertices are only assembled after
+    heights = np.empty((resolution, resolution))
+    np.multiply(
+        displacement_grid.ravel()[_grid_sample_indices(resolution)],
+        amplitude,
+        out=heights.reshape(-1),
+    )
 
     # Apply smoothing
     if smoothing_method == "gaussian":
-        vertices = apply_gaussian_smoothing(vertices, resolution, sigma=smoothing_strength)
+        heights = _gaussian_smooth_grid(heights, smoothing_strength)
     elif smoothing_method == "bilinear":
-        vertices = apply_bilinear_interpolation(
-            vertices, resolution, iterations=int(smoothing_strength)
-        )
+        heights = _bilinear_smooth_grid(heights, int(smoothing_strength))
+
+    vertices = base_vertices.copy()
+    vertices[:, 2] = heights.reshape(-1)
 
     # Compute normals
     normals = compute_vertex_normals(vertices, faces)
 
     return {
         "vertices": vertices,
-        "faces": faces,
+        "faces": faces.copy(),  # The cached faces are read-only
         "normals": normals,
     }
@@ -1,12 +1,15 @@
 """Image analysis engine - main module."""
 
+import hashlib
+import os
+from collections import OrderedDict
 from typing import Any
 
 import cv2
 import numpy as np
 
 from app.core.image_analysis.edge_detection import detect_edges, compute_edge_metrics
-from app.core.image_analysis.symmetry import detect_symmetry
+from app.core.image_analysis.symmetry import detect_symmetry, find_center_of_rotation
 from app.core.image_analysis.geometry_extractor import extract_geometry
 from app.core.image_analysis.preprocessor import preprocess_image
 from app.core.image_analysis.tracer import (
@@ -21,6 +24,11 @@ _edges_cache: dict[str, dict] = {}
 _symmetry_cache: dict[str, dict] = {}
 _geometry_cache: dict[str, dict] = {}
 
+# Edge detection results keyed by file, modification time and edge parameters;
+# least recently used entries are evicted beyond _EDGE_DETECTION_CACHE_SIZE
+_EDGE_DETECTION_CACHE_SIZE = 64
+_edge_detection_cache: OrderedDict[str, dict] = OrderedDict()
+
 
 async def analyze_image(
     image_path: str,
@@ -51,28 +59,46 @@ async def analyze_image(
 
     preprocessed = preprocess_image(img, blur_kernel_size)
 
-    # Edge detection
-    edges_result = await run_edge_detection(
-        preprocessed,
-        edge_threshold_low,
-        edge_threshold_high,
+    # Edge detection (reused while the file and parameters are unchanged)
+    edge_key = _edge_cache_key(
+        image_path, edge_threshold_low, edge_threshold_high, blur_kernel_size
     )
+    # The cache keeps its own dict, so callers mutating a result can't
+    # corrupt later hits
+    cached = _edge_detection_cache.get(edge_key)
+    if cached is None:
+        edges_result = await run_edge_detection(
+            preprocessed,
+            edge_threshold_low,
+            edge_threshold_high,
+        )
+        _edge_detection_cache[edge_key] = dict(edges_result)
+        if len(_edge_detection_cache) > _EDGE_DETECTION_CACHE_SIZE:
+            _edge_detection_cache.popitem(last=False)
+    else:
+        _edge_detection_cache.move_to_end(edge_key)
+        edges_result = dict(cached)
 
     results: dict[str, Any] = {"edges": edges_result}
 
+    # Otsu threshold + moments centroid, shared by symmetry and geometry
+    content_center = None
+    if detect_symmetry or extract_geometry:
+        content_center = find_center_of_rotation(preprocessed)
+
     # Symmetry detection
     if detect_symmetry:
-        symmetry_result = await run_symmetry_detection(preprocessed)
+        symmetry_result = await run_symmetry_detection(preprocessed, content_center)
         results["symmetry"] = symmetry_result
 
     # Geometry extraction
     if extract_geometry:
-        geometry_result = await run_geometry_extraction(preprocessed, edges_result)
+        geometry_result = await run_geometry_extraction(
+            preprocessed, edges_result, content_center
+        )
         results["geometry"] = geometry_result
 
     # Cache results by generating a hash from the path
-    import hashlib
-
     image_id = hashlib.md5(image_path.encode()).hexdigest()[:16]
     _edges_cache[image_id] = edges_result
     if detect_symmetry:
@@ -83,6 +109,18 @@ async def analyze_image(
     return results
 
 
+def _edge_cache_key(
+    image_path: str,
+    threshold_low: int,
+    threshold_high: int,
+    blur_kernel_size: int,
+) -> str:
+    """Build the edge detection cache key; the mtime invalidates edited files."""
+    mtime_ns = os.stat(image_path).st_mtime_ns
+    raw = f"{image_path}:{mtime_ns}:{threshold_low}:{threshold_high}:{blur_kernel_size}"
+    return hashlib.md5(raw.encode()).hexdigest()[:16]
+
+
 async def run_edge_detection(
     preprocessed: np.ndarray,
     threshold_low: int,
@@ -98,21 +136,25 @@ async def run_edge_detection(
     return metrics
 
 
-async def run_symmetry_detection(preprocessed: np.ndarray) -> dict:
+async def run_symmetry_detection(
+    preprocessed: np.ndarray,
+    content_center: tuple[float, float] | None = None,
+) -> dict:
     """Run symmetry detection."""
     from app.core.image_analysis.symmetry import detect_symmetry as symmetry_detect
 
-    return symmetry_detect(preprocessed)
+    return symmetry_detect(preprocessed, content_center=content_center)
 
 
 async def run_geometry_extraction(
     preprocessed: np.ndarray,
     edges_result: dict,
+    content_center: tuple[float, float] | None = None,
 ) -> dict:
     """Extract geometric parameters."""
     from app.core.image_analysis.geometry_extractor import extract_geometry as geo_extract
 
-    return geo_extract(preprocessed, edges_result)
+    return geo_extract(preprocessed, edges_result, centroid=content_center)
 
 
 def get_cached_edges(image_id: str) -> dict | None:
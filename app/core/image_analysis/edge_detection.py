@@ -3,6 +3,7 @@
 import cv2
 import numpy as np
 from scipy import ndimage
+from scipy.spatial import cKDTree
 
 
 def detect_edges(
@@ -36,28 +37,25 @@ def detect_edges(
         # Sobel edges
         sobel = _sobel_edges(preprocessed)
         
-        # Combine with weighted average
-        combined = cv2.addWeighted(canny, 0.6, sobel, 0.4, 0)
+        # Combine: the old 0.6*canny + 0.4*sobel > 50 blend is met by every
+        # Canny pixel (0.6*255 > 50) and by Sobel alone once 0.4*sobel rounds
+        # above 50 (sobel >= 127), so it reduces to a uint8 threshold + OR
+        _, strong_sobel = cv2.threshold(sobel, 126, 255, cv2.THRESH_BINARY)
         
-        # Threshold to binary
-        _, binary = cv2.threshold(combined, 50, 255, cv2.THRESH_BINARY)
-        
-        return binary
+        return cv2.bitwise_or(canny, strong_sobel)
 
 
 def _sobel_edges(image: np.ndarray) -> np.ndarray:
     """Compute Sobel edge magnitude."""
-    # Compute gradients
-    sobel_x = cv2.Sobel(image, cv2.CV_64F, 1, 0, ksize=3)
-    sobel_y = cv2.Sobel(image, cv2.CV_64F, 0, 1, ksize=3)
+    # Compute gradients (16-bit is exact for 3x3 Sobel on 8-bit input)
+    sobel_x = cv2.Sobel(image, cv2.CV_16S, 1, 0, ksize=3)
+    sobel_y = cv2.Sobel(image, cv2.CV_16S, 0, 1, ksize=3)
     
     # Compute magnitude
-    magnitude = np.sqrt(sobel_x**2 + sobel_y**2)
+    magnitude = cv2.magnitude(sobel_x.astype(np.float32), sobel_y.astype(np.float32))
     
     # Normalize to 0-255
-    magnitude = cv2.normalize(magnitude, None, 0, 255, cv2.NORM_MINMAX)
-    
-    return magnitude.astype(np.uint8)
+    return cv2.normalize(magnitude, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
 
 
 def compute_edge_metrics(edges: np.ndarray, original: np.ndarray) -> dict:
@@ -119,23 +117,18 @@ def _compute_dominant_angles(edges: np.ndarray, top_n: int = 5) -> list[float]:
     if lines is None or len(lines) == 0:
         return []
     
-    # Compute angles of all lines
-    angles = []
-    for line in lines:
-        x1, y1, x2, y2 = line[0]
-        angle = np.degrees(np.arctan2(y2 - y1, x2 - x1))
-        # Normalize to 0-180 range
-        angle = angle % 180
-        angles.append(angle)
-    
-    if not angles:
-        return []
+    # Compute angles of all lines, normalized to 0-180 range
+    segments = lines.reshape(-1, 4)
+    angles = np.degrees(
+        np.arctan2(segments[:, 3] - segments[:, 1], segments[:, 2] - segments[:, 0])
+    ) % 180
     
     # Find dominant angles using histogram
     hist, bin_edges = np.histogram(angles, bins=36, range=(0, 180))
     
-    # Get indices of top peaks
-    peak_indices = np.argsort(hist)[-top_n:]
+    # Get indices of top peaks (order does not matter, the result is sorted)
+    top_n = min(top_n, len(hist))
+    peak_indices = np.argpartition(hist, -top_n)[-top_n:]
     
     # Convert bin indices to angles
     dominant = []
@@ -160,36 +153,56 @@ def detect_edge_intersections(edges: np.ndarray, min_distance: int = 10) -> list
     """
     # Apply skeleton to get thin edges
     from skimage.morphology import skeletonize
-    skeleton = skeletonize(edges > 0)
-    
-    # Define intersection kernels (3x3 patterns that indicate junctions)
-    kernels = [
-        np.array([[1, 0, 1], [0, 1, 0], [1, 0, 1]]),  # X
-        np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0]]),  # +
-        np.array([[1, 0, 1], [0, 1, 0], [0, 1, 0]]),  # Y variants
-        np.array([[0, 1, 0], [0, 1, 1], [1, 0, 0]]),  # T variants
-    ]
-    
-    intersections = []
-    
-    for kernel in kernels:
-        # Find matches using hit-or-miss transform approximation
-        result = ndimage.convolve(skeleton.astype(np.float64), kernel.astype(np.float64))
-        threshold = np.sum(kernel) - 0.5
-        matches = np.argwhere(result >= threshold)
+    skeleton = skeletonize(edges > 0).astype(np.uint8)
+    
+    # Junctions are skeleton pixels with 3+ skeleton neighbors (X, +, Y and T shapes);
+    # one uint8 pass over the 3x3 window counts the center plus its neighbors
+    window_count = ndimage.convolve(skeleton, np.ones((3, 3), dtype=np.uint8), mode="constant")
+    neighbor_count = window_count - skeleton
+    matches = np.argwhere((skeleton > 0) & (neighbor_count >= 3))
+    
+    if len(matches) == 0:
+        return []
+    
+    points = matches[:, ::-1]  # (y, x) -> (x, y)
+    scores = neighbor_count[matches[:, 0], matches[:, 1]]
+    
+    # Greedy suppression, strongest junctions first
+    order = np.argsort(-scores.astype(np.int16), kind="stable")
+    points = points[order]
+    
+    return _suppress_close_points(points, min_distance)
+
+
+def _suppress_close_points(points: np.ndarray, min_distance: float) -> list[tuple[int, int]]:
+    """
+    Greedily keep points in order, dropping any closer than min_distance to a kept one.
+    
+    Args:
+        points: Nx2 array of (x, y) points in priority order
+        min_distance: Minimum distance between kept points
+    
+    Returns:
+        List of kept (x, y) points
+    """
+    tree = cKDTree(points)
+    min_distance_sq = min_distance * min_distance
+    suppressed = np.zeros(len(points), dtype=bool)
+    
+    kept = []
+    for i, point in enumerate(points):
+        if suppressed[i]:
+            continue
+        kept.append(i)
         
-        for y, x in matches:
-            # Check minimum distance from existing points
-            is_far_enough = True
-            for ex, ey in intersections:
-                if np.sqrt((x - ex)**2 + (y - ey)**2) < min_distance:
-                    is_far_enough = False
-                    break
-            
-            if is_far_enough:
-                intersections.append((int(x), int(y)))
-    
-    return intersections
+        # Suppress neighbors strictly inside min_distance (squared compare, no sqrt)
+        neighbors = np.asarray(tree.query_ball_point(point, r=min_distance), dtype=np.intp)
+        offsets = points[neighbors] - point
+        too_close = (offsets * offsets).sum(axis=1) < min_distance_sq
+        suppressed[neighbors[too_close]] = True
+    
+    # Convert the survivors to Python int tuples in one batch
+    return list(map(tuple, points[kept].astype(np.int64).tolist()))
 
 
 def find_contour_hierarchy(edges: np.ndarray) -> dict:
@@ -208,25 +221,26 @@ def find_contour_hierarchy(edges: np.ndarray) -> dict:
     
     hierarchy = hierarchy[0]
     
-    # Count depth levels and contour types
-    outer_count = 0
-    inner_count = 0
-    max_depth = 0
-    
-    for i, h in enumerate(hierarchy):
-        # h = [next, prev, child, parent]
-        if h[3] == -1:  # No parent = outer contour
-            outer_count += 1
-        else:
-            inner_count += 1
+    # Count contour types: h = [next, prev, child, parent]
+    parents = hierarchy[:, 3]
+    outer_count = int(np.count_nonzero(parents == -1))  # No parent = outer contour
+    inner_count = len(parents) - outer_count
+    
+    # Depth of each contour, memoized so every parent chain is walked only once
+    depths = np.full(len(parents), -1, dtype=np.int64)
+    for i in range(len(parents)):
+        path = []
+        node = i
+        while node != -1 and depths[node] < 0:
+            path.append(node)
+            node = parents[node]
         
-        # Calculate depth by traversing parent chain
-        depth = 0
-        parent = h[3]
-        while parent != -1:
+        depth = -1 if node == -1 else depths[node]
+        for node in reversed(path):
             depth += 1
-            parent = hierarchy[parent][3]
-        max_depth = max(max_depth, depth)
+            depths[node] = depth
+    
+    max_depth = int(depths.max())
     
     return {
         "depth": max_depth,
@@ -4,14 +4,24 @@ import cv2
 import numpy as np
 from typing import List, Tuple
 
+from app.core.image_analysis.peaks import count_peaks
+from app.core.image_analysis.preprocessor import content_bounding_box, radial_distances
 
-def extract_geometry(image: np.ndarray, edges_result: dict) -> dict:
+
+def extract_geometry(
+    image: np.ndarray,
+    edges_result: dict,
+    centroid: Tuple[float, float] | None = None,
+) -> dict:
     """
     Extract geometric parameters from an analyzed image.
 
     Args:
         image: Preprocessed grayscale image
-        edges_result: Results from edge detection
+        edges_result: Results from edge detection; an optional "canny_edges"
+            entry holding ``cv2.Canny(image, 50, 150)`` is reused for the
+            radius estimate instead of being recomputed
+        centroid: Precomputed content centroid; computed if not given
 
     Returns:
         Dictionary containing geometric parameters
@@ -22,10 +32,11 @@ def extract_geometry(image: np.ndarray, edges_result: dict) -> dict:
     bounding_box = _get_content_bounding_box(image)
 
     # Find centroid
-    centroid = _compute_centroid(image)
+    if centroid is None:
+        centroid = _compute_centroid(image)
 
     # Estimate radius for circular patterns
-    radius = _estimate_radius(image, centroid)
+    radius = _estimate_radius(image, centroid, edges_result.get("canny_edges"))
 
     # Get dominant angles from edges
     dominant_angles = edges_result.get("dominant_angles", [])
@@ -53,18 +64,12 @@ def _get_content_bounding_box(image: np.ndarray) -> Tuple[int, int, int, int]:
     Returns:
         Tuple of (x, y, width, height)
     """
-    _, thresh = cv2.threshold(image, 10, 255, cv2.THRESH_BINARY)
-
-    contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    bbox = content_bounding_box(image)
 
-    if not contours:
+    if bbox is None:
         return (0, 0, image.shape[1], image.shape[0])
 
-    # Get bounding rect of all contours combined
-    all_points = np.vstack(contours)
-    x, y, w, h = cv2.boundingRect(all_points)
-
-    return (int(x), int(y), int(w), int(h))
+    return bbox
 
 
 def _compute_centroid(image: np.ndarray) -> Tuple[float, float]:
@@ -85,24 +90,24 @@ def _compute_centroid(image: np.ndarray) -> Tuple[float, float]:
 def _estimate_radius(
     image: np.ndarray,
     center: Tuple[float, float],
+    edges: np.ndarray | None = None,
 ) -> float | None:
     """
     Estimate the radius of a circular pattern.
 
-    Uses the average distance from center to edge pixels.
+    Uses the average distance from center to edge pixels. `edges` is a
+    precomputed ``cv2.Canny(image, 50, 150)`` map, computed if not given.
     """
     # Edge detection
-    edges = cv2.Canny(image, 50, 150)
-
-    # Find edge pixels
-    edge_points = np.argwhere(edges > 0)
+    if edges is None:
+        edges = cv2.Canny(image, 50, 150)
 
-    if len(edge_points) == 0:
+    # Distances from center, computed at the edge pixels only
+    edge_points = cv2.findNonZero(edges)
+    if edge_points is None:
         return None
 
-    # Calculate distances from center
-    cx, cy = center
-    distances = np.sqrt((edge_points[:, 1] - cx) ** 2 + (edge_points[:, 0] - cy) ** 2)
+    distances = radial_distances(edge_points[:, 0, 0], edge_points[:, 0, 1], center)
 
     # Use median distance as estimated radius
     return float(np.median(distances))
@@ -115,35 +120,26 @@ def _detect_repetition_frequency(image: np.ndarray) -> int | None:
     Returns:
         Estimated number of repetitions, or None if not detected
     """
-    # Compute 2D autocorrelation
-    f = np.fft.fft2(image.astype(np.float64))
-    autocorr = np.fft.ifft2(f * np.conj(f)).real
+    # Compute 2D autocorrelation (Wiener-Khinchin: IDFT of the power spectrum)
+    spectrum = cv2.dft(image.astype(np.float32), flags=cv2.DFT_COMPLEX_OUTPUT)
+    power = cv2.mulSpectrums(spectrum, spectrum, 0, conjB=True)
+    autocorr = cv2.idft(power, flags=cv2.DFT_SCALE | cv2.DFT_REAL_OUTPUT)
 
     # Normalize
     autocorr = autocorr / autocorr.max()
 
-    # Find peaks in autocorrelation
-    from scipy.signal import find_peaks
-
     # Look at horizontal and vertical slices through center
     h, w = autocorr.shape
     h_slice = autocorr[h // 2, :]
     v_slice = autocorr[:, w // 2]
 
-    # Find peaks
-    h_peaks, _ = find_peaks(h_slice, height=0.3, distance=10)
-    v_peaks, _ = find_peaks(v_slice, height=0.3, distance=10)
+    # Count peaks in autocorrelation
+    h_count = count_peaks(h_slice, height=0.3, distance=10)
+    v_count = count_peaks(v_slice, height=0.3, distance=10)
 
     # Estimate frequency from peak spacing
-    if len(h_peaks) >= 2:
-        h_freq = len(h_peaks)
-    else:
-        h_freq = 0
-
-    if len(v_peaks) >= 2:
-        v_freq = len(v_peaks)
-    else:
-        v_freq = 0
+    h_freq = h_count if h_count >= 2 else 0
+    v_freq = v_count if v_count >= 2 else 0
 
     freq = max(h_freq, v_freq)
 
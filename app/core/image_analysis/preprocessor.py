@@ -1,5 +1,7 @@
 """Image preprocessing utilities."""
 
+from functools import lru_cache
+
 import cv2
 import numpy as np
 
@@ -26,27 +28,33 @@ def preprocess_image(
     Returns:
         Preprocessed grayscale image
     """
-    # Convert to grayscale if needed
+    # Convert to grayscale if needed (the blur below writes a fresh image,
+    # so a grayscale input needs no defensive copy)
     if len(image.shape) == 3:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        blur_dst = gray
     else:
-        gray = image.copy()
+        gray = image
+        blur_dst = None
     
     # Ensure kernel size is odd
     if blur_kernel_size % 2 == 0:
         blur_kernel_size += 1
     
     # Apply Gaussian blur
-    blurred = cv2.GaussianBlur(gray, (blur_kernel_size, blur_kernel_size), 0)
+    blurred = cv2.GaussianBlur(gray, (blur_kernel_size, blur_kernel_size), 0, dst=blur_dst)
     
-    # Normalize intensity
+    # Normalize intensity: a min-max stretch never merges grey levels and
+    # equalization only depends on the order and counts of levels, so the
+    # stretch cannot change the equalized result -- except for a flat image,
+    # which the stretch maps to all zeros
     if normalize:
-        blurred = cv2.normalize(blurred, None, 0, 255, cv2.NORM_MINMAX)
-    
-    # Histogram equalization for better contrast
-    equalized = cv2.equalizeHist(blurred)
+        min_val, max_val, _, _ = cv2.minMaxLoc(blurred)
+        if min_val == max_val:
+            blurred[...] = 0
     
-    return equalized
+    # Histogram equalization for better contrast (in place)
+    return cv2.equalizeHist(blurred, dst=blurred)
 
 
 def resize_for_processing(
@@ -82,6 +90,18 @@ def resize_for_processing(
     return resized, scale
 
 
+def downsample_to_max_side(image: np.ndarray, max_size: int) -> tuple[np.ndarray, float]:
+    """Shrink an image (keeping aspect ratio) so its longest side is at most max_size."""
+    height, width = image.shape[:2]
+    longest = max(height, width)
+    if longest <= max_size:
+        return image, 1.0
+    
+    scale = max_size / longest
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA), scale
+
+
 def apply_morphological_cleanup(
     binary_image: np.ndarray,
     operation: str = "close",
@@ -100,9 +120,7 @@ def apply_morphological_cleanup(
     Returns:
         Cleaned binary image
     """
-    kernel = cv2.getStructuringElement(
-        cv2.MORPH_ELLIPSE, (kernel_size, kernel_size)
-    )
+    kernel = _ellipse_kernel(kernel_size)
     
     if operation == "open":
         result = cv2.morphologyEx(
@@ -122,6 +140,16 @@ def apply_morphological_cleanup(
     return result
 
 
+@lru_cache(maxsize=16)
+def _ellipse_kernel(kernel_size: int) -> np.ndarray:
+    """Cached (read-only) elliptical structuring element."""
+    kernel = cv2.getStructuringElement(
+        cv2.MORPH_ELLIPSE, (kernel_size, kernel_size)
+    )
+    kernel.flags.writeable = False
+    return kernel
+
+
 def extract_roi(
     image: np.ndarray,
     margin_percent: float = 0.05,
@@ -136,22 +164,14 @@ def extract_roi(
     Returns:
         Tuple of (cropped image, bounding box as (x, y, w, h))
     """
-    # Threshold to find content
-    _, thresh = cv2.threshold(image, 10, 255, cv2.THRESH_BINARY)
+    bbox = content_bounding_box(image)
     
-    # Find contours
-    contours, _ = cv2.findContours(
-        thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
-    )
-    
-    if not contours:
+    if bbox is None:
         return image, (0, 0, image.shape[1], image.shape[0])
     
-    # Get bounding box of all contours
-    x_min = min(cv2.boundingRect(c)[0] for c in contours)
-    y_min = min(cv2.boundingRect(c)[1] for c in contours)
-    x_max = max(cv2.boundingRect(c)[0] + cv2.boundingRect(c)[2] for c in contours)
-    y_max = max(cv2.boundingRect(c)[1] + cv2.boundingRect(c)[3] for c in contours)
+    x_min, y_min, w, h = bbox
+    x_max = x_min + w
+    y_max = y_min + h
     
     # Add margin
     height, width = image.shape[:2]
@@ -166,3 +186,48 @@ def extract_roi(
     cropped = image[y_min:y_max, x_min:x_max]
     
     return cropped, (x_min, y_min, x_max - x_min, y_max - y_min)
+
+
+def content_bounding_box(
+    image: np.ndarray,
+    threshold: int = 10,
+) -> tuple[int, int, int, int] | None:
+    """
+    Bounding box of all pixels brighter than a threshold.
+    
+    Equivalent to the combined bounding box of the external contours of the
+    thresholded image, but computed by cv2.boundingRect directly on the
+    binary mask so no contours need to be traced.
+    
+    Args:
+        image: Grayscale image
+        threshold: Pixels above this value count as content
+    
+    Returns:
+        Bounding box as (x, y, w, h), or None if there is no content
+    """
+    _, thresh = cv2.threshold(image, threshold, 255, cv2.THRESH_BINARY)
+    
+    x, y, w, h = cv2.boundingRect(thresh)
+    if w == 0 or h == 0:
+        return None
+    
+    return (int(x), int(y), int(w), int(h))
+
+
+def radial_distances(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    center: tuple[float, float],
+) -> np.ndarray:
+    """
+    Float32 distance of each (x, y) from center.
+    
+    xs and ys broadcast against each other, so pixel coordinate lists and
+    ``np.ogrid`` axes (a whole distance map) both work.
+    """
+    cx, cy = center
+    dx = (xs - cx).astype(np.float32)
+    dy = (ys - cy).astype(np.float32)
+    
+    return np.sqrt(dx * dx + dy * dy)
@@ -1,12 +1,33 @@
 """Symmetry detection algorithms."""
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 import cv2
 import numpy as np
 from scipy import ndimage
+from scipy.signal import correlate
 from typing import Tuple, List
 
+from app.core.image_analysis.peaks import count_peaks
+from app.core.image_analysis.preprocessor import downsample_to_max_side
+
+# Longest image side used for the rotation/reflection correlation searches
+_SYMMETRY_SEARCH_SIZE = 256
+
+# Correlation treated as an exact match; no other angle can meaningfully beat it
+_PERFECT_MATCH_CORRELATION = 0.98
+
+# Smallest search image (in pixels) whose rotation angles are scored in
+# parallel; below it the per-angle work is too small to pay for the handoff
+_PARALLEL_SEARCH_MIN_PIXELS = 128 * 128
+
 
-def detect_symmetry(image: np.ndarray) -> dict:
+def detect_symmetry(
+    image: np.ndarray,
+    content_center: Tuple[float, float] | None = None,
+) -> dict:
     """
     Detect various types of symmetry in an image.
     
@@ -17,6 +38,8 @@ def detect_symmetry(image: np.ndarray) -> dict:
     
     Args:
         image: Preprocessed grayscale image
+        content_center: Precomputed content centroid (see
+            find_center_of_rotation); computed here if not given
     
     Returns:
         Dictionary containing symmetry analysis results
@@ -25,7 +48,9 @@ def detect_symmetry(image: np.ndarray) -> dict:
     center = (width // 2, height // 2)
     
     # Detect rotational symmetry
-    has_rotational, rotational_order, rot_center, rot_score = _detect_rotational_symmetry(image)
+    has_rotational, rotational_order, rot_center, rot_score = _detect_rotational_symmetry(
+        image, content_center=content_center
+    )
     
     # Detect reflectional symmetry
     has_reflectional, reflection_axes = _detect_reflectional_symmetry(image)
@@ -46,7 +71,9 @@ def detect_symmetry(image: np.ndarray) -> dict:
 def _detect_rotational_symmetry(
     image: np.ndarray,
     angles_to_test: list[int] = [30, 45, 60, 72, 90, 120, 180],
-    threshold: float = 0.85,
+    threshold: float = 0.70,
+    content_center: Tuple[float, float] | None = None,
+    search_size: int = _SYMMETRY_SEARCH_SIZE,
 ) -> Tuple[bool, int | None, Tuple[float, float] | None, float]:
     """
     Detect rotational symmetry by comparing image with rotated versions.
@@ -54,53 +81,73 @@ def _detect_rotational_symmetry(
     Args:
         image: Grayscale image
         angles_to_test: Rotation angles to test (divisors of 360)
-        threshold: Correlation threshold for symmetry detection
+        threshold: Pearson correlation threshold for symmetry detection
+        content_center: Precomputed content centroid; computed if not given
+        search_size: Longest side the image is downsampled to before the
+            rotation search
     
     Returns:
-        Tuple of (has_symmetry, order, center, best_score)
+        Tuple of (has_symmetry, order, center, best_score), with best_score
+        the best Pearson correlation in [-1, 1]
     """
-    height, width = image.shape[:2]
-    center = (width / 2, height / 2)
-    
-    # Ensure uint8 input for OpenCV thresholding
+    # Ensure uint8 input for OpenCV thresholding and warping
     img_u8 = _to_uint8(image)
 
-    # Find centroid of content as potential center
-    _, thresh = cv2.threshold(img_u8, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    moments = cv2.moments(thresh)
-
-    if moments["m00"] != 0:
-        cx = moments["m10"] / moments["m00"]
-        cy = moments["m01"] / moments["m00"]
-        content_center = (cx, cy)
-    else:
-        content_center = center
+    # Find centroid of content as potential center (full-resolution coordinates)
+    if content_center is None:
+        content_center = find_center_of_rotation(img_u8)
+    
+    # Rotate and correlate on a downsampled copy; the center scales with it
+    small, scale = downsample_to_max_side(img_u8, search_size)
+    height, width = small.shape[:2]
+    search_center = (content_center[0] * scale, content_center[1] * scale)
     
     best_order = None
-    best_score = 0.0
+    best_score = -1.0
     
-    for angle in angles_to_test:
-        # Compute how many rotations of this angle fit in 360
-        order = 360 // angle
-
+    # Normalize the reference once; every rotation is compared against it
+    reference = _prepare_correlation_reference(small)
+    if reference is None:
+        return False, None, None, -1.0
+    
+    def score_angle(angle: int) -> float:
         # Rotate image (use uint8 input for warpAffine)
-        rotation_matrix = cv2.getRotationMatrix2D(content_center, angle, 1.0)
+        rotation_matrix = cv2.getRotationMatrix2D(search_center, angle, 1.0)
         rotated_u8 = cv2.warpAffine(
-            img_u8, rotation_matrix, (width, height),
+            small, rotation_matrix, (width, height),
             flags=cv2.INTER_LINEAR,
             borderMode=cv2.BORDER_CONSTANT,
             borderValue=0,
         )
 
-        # Convert back to float for correlation
-        rotated = rotated_u8.astype(np.float64)
-
         # Compute correlation
-        correlation = _compute_image_correlation(image.astype(np.float64), rotated)
+        return _correlate_with_reference(reference, rotated_u8)
 
-        if correlation > best_score:
-            best_score = correlation
-            best_order = order
+    # Smallest angle (highest order) first, so ties keep favouring the
+    # higher order and a near-perfect match there ends the search early
+    angles = sorted(angles_to_test)
+    
+    # warpAffine and the BLAS dot release the GIL, so on large enough search
+    # images the angles score in parallel on the shared pool
+    executor = _rotation_search_executor() if small.size >= _PARALLEL_SEARCH_MIN_PIXELS else None
+    futures = [executor.submit(score_angle, angle) for angle in angles] if executor else []
+    scores = (future.result() for future in futures) if executor else map(score_angle, angles)
+    
+    try:
+        for angle, correlation in zip(angles, scores):
+            # Compute how many rotations of this angle fit in 360
+            order = 360 // angle
+
+            if correlation > best_score:
+                best_score = correlation
+                best_order = order
+
+            if correlation >= _PERFECT_MATCH_CORRELATION:
+                break
+    finally:
+        # Angles not reached after an early exit are dropped if not yet started
+        for future in futures:
+            future.cancel()
     
     has_symmetry = best_score >= threshold
     
@@ -112,11 +159,20 @@ def _detect_rotational_symmetry(
     )
 
 
+@lru_cache(maxsize=1)
+def _rotation_search_executor() -> ThreadPoolExecutor | None:
+    """Thread pool shared by rotation searches, created on first use (None on one core)."""
+    max_workers = min(8, os.cpu_count() or 1)
+    if max_workers <= 1:
+        return None
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="symmetry")
+
+
 def _detect_reflectional_symmetry(
     image: np.ndarray,
-    threshold: float = 0.85,
+    threshold: float = 0.70,
+    search_size: int = _SYMMETRY_SEARCH_SIZE,
 ) -> Tuple[bool, List[float]]:
-    img_u8 = _to_uint8(image)
     """
     Detect reflectional (mirror) symmetry.
     
@@ -124,82 +180,106 @@ def _detect_reflectional_symmetry(
     
     Args:
         image: Grayscale image
-        threshold: Correlation threshold
+        threshold: Pearson correlation threshold
+        search_size: Longest side the image is downsampled to before testing
     
     Returns:
         Tuple of (has_symmetry, list of axis angles in degrees)
     """
+    img_u8, _ = downsample_to_max_side(_to_uint8(image), search_size)
     axes = []
     
+    # Normalize the reference image once and reuse it for every axis
+    reference = _prepare_correlation_reference(img_u8)
+    if reference is None:
+        return False, axes
+    
     # Test horizontal axis (flip vertically)
     flipped_h = cv2.flip(img_u8, 0)
-    if _compute_image_correlation(image.astype(np.float64), flipped_h.astype(np.float64)) >= threshold:
+    if _correlate_with_reference(reference, flipped_h) >= threshold:
         axes.append(0.0)  # Horizontal axis
 
     # Test vertical axis (flip horizontally)
     flipped_v = cv2.flip(img_u8, 1)
-    if _compute_image_correlation(image.astype(np.float64), flipped_v.astype(np.float64)) >= threshold:
+    if _correlate_with_reference(reference, flipped_v) >= threshold:
         axes.append(90.0)  # Vertical axis
     
     # Test diagonal axes
-    height, width = image.shape[:2]
-    center = (width / 2, height / 2)
+    height, width = img_u8.shape[:2]
     
     for angle in [45, 135]:
-        # Rotate, flip, rotate back
-        rot_matrix = cv2.getRotationMatrix2D(center, angle, 1.0)
-        rot_back_matrix = cv2.getRotationMatrix2D(center, -angle, 1.0)
+        reflect_matrix = _diagonal_reflection_matrix(width, height, angle)
+        reflected = cv2.warpAffine(img_u8, reflect_matrix, (width, height), flags=cv2.INTER_LINEAR)
         
-        rotated = cv2.warpAffine(image, rot_matrix, (width, height))
-        flipped = cv2.flip(rotated, 1)
-        rotated_back = cv2.warpAffine(flipped, rot_back_matrix, (width, height))
-        
-        if _compute_image_correlation(image, rotated_back) >= threshold:
+        if _correlate_with_reference(reference, reflected) >= threshold:
             axes.append(float(angle))
     
     return len(axes) > 0, axes
 
 
-def _compute_image_correlation(img1: np.ndarray, img2: np.ndarray) -> float:
+@lru_cache(maxsize=64)
+def _diagonal_reflection_matrix(width: int, height: int, angle: int) -> np.ndarray:
     """
-    Compute normalized cross-correlation between two images.
+    Affine matrix reflecting an image across a diagonal axis through its center.
     
-    Args:
-        img1, img2: Grayscale images of same size
+    Rotate, flip horizontally and rotate back, composed into a single 2x3
+    matrix so the reflection is one resample. Cached (read-only) per image size.
+    """
+    # Pixel-center origin, matching the flip below; (w/2, h/2) would shift the
+    # 135 degree reflection by a pixel, enough to miss thin-line symmetry
+    center = ((width - 1) / 2, (height - 1) / 2)
+    
+    # Horizontal flip (x -> width - 1 - x) as a homogeneous matrix
+    flip_x = np.array([[-1.0, 0.0, width - 1], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+    rot = np.vstack([cv2.getRotationMatrix2D(center, angle, 1.0), [0.0, 0.0, 1.0]])
+    rot_back = np.vstack([cv2.getRotationMatrix2D(center, -angle, 1.0), [0.0, 0.0, 1.0]])
+    
+    reflect_matrix = np.ascontiguousarray((rot_back @ flip_x @ rot)[:2])
+    reflect_matrix.flags.writeable = False
+    return reflect_matrix
+
+
+def _prepare_correlation_reference(image: np.ndarray) -> np.ndarray | None:
+    """
+    Flatten an image into float32 correlation weights (a - mean) / (N * std).
     
-    Returns:
-        Correlation coefficient in range [0, 1]
+    With these weights the Pearson correlation against any image b reduces to
+    ``dot(weights, b) / std(b)``, so a reference compared many times is only
+    normalized once. Returns None for zero-variance images.
     """
-    # Convert to float
-    f1 = img1.astype(np.float64)
-    f2 = img2.astype(np.float64)
+    mean, std = cv2.meanStdDev(image)
     
     # Guard against zero-variance images
-    if f1.std() < 1e-8 or f2.std() < 1e-8:
-        return 0.0
+    if std[0, 0] < 1e-8:
+        return None
     
-    # Normalize
-    f1 = (f1 - f1.mean()) / (f1.std() + 1e-10)
-    f2 = (f2 - f2.mean()) / (f2.std() + 1e-10)
+    weights = image.astype(np.float32).ravel()
+    weights -= np.float32(mean[0, 0])
+    weights *= np.float32(1.0 / (weights.size * std[0, 0]))
+    return weights
+
+
+def _correlate_with_reference(reference: np.ndarray, image: np.ndarray) -> float:
+    """Pearson correlation of prepared reference weights with an image, in [-1, 1]."""
+    _, std = cv2.meanStdDev(image)
+    if std[0, 0] < 1e-8:
+        return -1.0
     
-    # Compute correlation
-    correlation = np.mean(f1 * f2)
+    # Single fused pass: BLAS dot product of the weights with the raw pixels
+    correlation = float(np.dot(reference, image.astype(np.float32).ravel())) / std[0, 0]
     
-    # Clamp to [0, 1]
-    return float(max(0, min(1, (correlation + 1) / 2)))
-
+    return max(-1.0, min(1.0, correlation))
 
 
 def _to_uint8(image: np.ndarray) -> np.ndarray:
     """Convert image to uint8 safely for OpenCV operations."""
     if image.dtype == np.uint8:
         return image
-    im = image.copy()
+    # Scale in float32 (every branch below allocates, so no defensive copy)
+    im = image.astype(np.float32, copy=False)
     if im.max() <= 1.0:
-        im = (im * 255.0).clip(0, 255).astype(np.uint8)
-    else:
-        im = im.clip(0, 255).astype(np.uint8)
-    return im
+        im = im * np.float32(255.0)
+    return np.clip(im, 0, 255).astype(np.uint8)
 
 
 def _compute_symmetry_score(rotation_score: float, num_reflection_axes: int) -> float:
@@ -207,14 +287,15 @@ def _compute_symmetry_score(rotation_score: float, num_reflection_axes: int) ->
     Compute overall symmetry score.
     
     Args:
-        rotation_score: Rotational symmetry correlation
+        rotation_score: Rotational symmetry Pearson correlation in [-1, 1]
         num_reflection_axes: Number of detected reflection axes
     
     Returns:
         Overall symmetry score in [0, 1]
     """
-    # Weight rotational symmetry more heavily
-    rot_component = rotation_score * 0.6
+    # Weight rotational symmetry more heavily; the correlation is mapped to
+    # [0, 1] so the score keeps the scale its consumers were tuned against
+    rot_component = max(0.0, min(1.0, (rotation_score + 1) / 2)) * 0.6
     
     # Reflection contribution (max 4 axes: h, v, 2 diagonals)
     ref_component = (num_reflection_axes / 4) * 0.4
@@ -270,34 +351,22 @@ def detect_radial_pattern(image: np.ndarray, center: Tuple[float, float]) -> dic
     if max_radius < 10:
         return {"is_radial": False, "num_arms": 0, "periodicity": 0}
     
-    # Sample along radial lines
-    num_angles = 360
-    angles = np.linspace(0, 2 * np.pi, num_angles, endpoint=False)
-    
-    radial_profiles = []
-    for angle in angles:
-        profile = []
-        for r in range(1, max_radius):
-            x = int(cx + r * np.cos(angle))
-            y = int(cy + r * np.sin(angle))
-            if 0 <= x < width and 0 <= y < height:
-                profile.append(image[y, x])
-        radial_profiles.append(profile)
+    # Sample along radial lines: one bilinear remap produces a rectangular
+    # (num_angles, max_radius - 1) array of profiles
+    map_x, map_y = _polar_sample_maps(float(cx), float(cy), max_radius)
+    profiles_array = cv2.remap(
+        image, map_x, map_y, cv2.INTER_LINEAR,
+        borderMode=cv2.BORDER_CONSTANT, borderValue=0,
+    )
     
     # Analyze angular periodicity
-    min_len = min(len(p) for p in radial_profiles)
-    profiles_array = np.array([p[:min_len] for p in radial_profiles])
-    
     # Compute autocorrelation of angular samples
-    mean_profile = profiles_array.mean(axis=1)
-    autocorr = np.correlate(mean_profile, mean_profile, mode="full")
+    mean_profile = profiles_array.mean(axis=1, dtype=np.float32)
+    autocorr = correlate(mean_profile, mean_profile, mode="full", method="fft")
     autocorr = autocorr[len(autocorr) // 2:]
     
     # Find peaks in autocorrelation
-    from scipy.signal import find_peaks
-    peaks, _ = find_peaks(autocorr, height=autocorr.max() * 0.5, distance=10)
-    
-    num_arms = len(peaks) if len(peaks) > 0 else 0
+    num_arms = count_peaks(autocorr, height=autocorr.max() * 0.5, distance=10)
     periodicity = 360 // num_arms if num_arms > 0 else 0
     
     return {
@@ -305,3 +374,21 @@ def detect_radial_pattern(image: np.ndarray, center: Tuple[float, float]) -> dic
         "num_arms": num_arms,
         "periodicity": periodicity,
     }
+
+
+@lru_cache(maxsize=16)
+def _polar_sample_maps(
+    cx: float,
+    cy: float,
+    max_radius: int,
+    num_angles: int = 360,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Read-only float32 cv2.remap maps sampling radii 1..max_radius-1 at each angle."""
+    angles = np.linspace(0, 2 * np.pi, num_angles, endpoint=False, dtype=np.float32)
+    radii = np.arange(1, max_radius, dtype=np.float32)
+    
+    map_x = cx + np.outer(np.cos(angles), radii)
+    map_y = cy + np.outer(np.sin(angles), radii)
+    map_x.flags.writeable = False
+    map_y.flags.writeable = False
+    return map_x, map_y
@@ -8,6 +8,8 @@ import cv2
 import numpy as np
 from typing import Literal
 
+from app.core.jit import HAS_NUMBA, njit
+
 
 def threshold_image(
     image: np.ndarray,
@@ -30,33 +32,34 @@ def threshold_image(
     Returns:
         Binary image where 255 = line pixels, 0 = background
     """
-    # Convert to grayscale if needed
+    # Convert to grayscale if needed; OpenCV writes the result to a new
+    # buffer, so a grayscale input is read in place rather than copied
     if len(image.shape) == 3:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     else:
-        gray = image.copy()
+        gray = np.ascontiguousarray(image)
+
+    # Invert if requested (useful when lines are dark on light background);
+    # the inverted threshold type does this in the same pass
+    threshold_type = cv2.THRESH_BINARY_INV if invert else cv2.THRESH_BINARY
 
     # Apply thresholding based on method
     if method == "binary":
-        _, binary = cv2.threshold(gray, threshold_value, 255, cv2.THRESH_BINARY)
+        _, binary = cv2.threshold(gray, threshold_value, 255, threshold_type)
     elif method == "adaptive":
         binary = cv2.adaptiveThreshold(
             gray,
             255,
             cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY,
+            threshold_type,
             blockSize=11,
             C=2,
         )
     elif method == "otsu":
-        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        _, binary = cv2.threshold(gray, 0, 255, threshold_type + cv2.THRESH_OTSU)
     else:
         raise ValueError(f"Unknown threshold method: {method}")
 
-    # Invert if requested (useful when lines are dark on light background)
-    if invert:
-        binary = cv2.bitwise_not(binary)
-
     return binary
 
 
@@ -78,6 +81,13 @@ def extract_plot_points(
     """
     height, width = binary_image.shape[:2]
 
+    if HAS_NUMBA and binary_image.ndim == 2:
+        # Scan and normalize in one compiled pass, straight into an (N, 2) array
+        points = _plot_points_jit(
+            np.ascontiguousarray(binary_image), max(1, sample_step), normalize
+        )
+        return list(zip(points[:, 0].tolist(), points[:, 1].tolist()))
+
     # Find all non-zero (line) pixels
     # np.argwhere returns (row, col) = (y, x), so we flip
     points_yx = np.argwhere(binary_image > 0)
@@ -89,16 +99,45 @@ def extract_plot_points(
     if sample_step > 1:
         points_yx = points_yx[::sample_step]
 
-    # Convert to (x, y) format
-    points = []
-    for y, x in points_yx:
-        if normalize:
-            # Normalize to [-1, 1] range
-            nx = (x / (width - 1)) * 2 - 1 if width > 1 else 0.0
-            ny = (y / (height - 1)) * 2 - 1 if height > 1 else 0.0
-            points.append((float(nx), float(ny)))
-        else:
-            points.append((float(x), float(y)))
+    xs = points_yx[:, 1].astype(np.float64)
+    ys = points_yx[:, 0].astype(np.float64)
+
+    if normalize:
+        # Normalize to [-1, 1] range
+        xs = (xs / (width - 1)) * 2 - 1 if width > 1 else np.zeros_like(xs)
+        ys = (ys / (height - 1)) * 2 - 1 if height > 1 else np.zeros_like(ys)
+
+    # Convert to (x, y) tuples in bulk (tolist yields native Python floats)
+    return list(zip(xs.tolist(), ys.tolist()))
+
+
+@njit(cache=True)
+def _plot_points_jit(binary: np.ndarray, sample_step: int, normalize: bool) -> np.ndarray:
+    """Every sample_step-th line pixel in row-major order, as an (N, 2) array of (x, y)."""
+    height, width = binary.shape
+
+    count = 0
+    for y in range(height):
+        for x in range(width):
+            if binary[y, x] > 0:
+                count += 1
+
+    points = np.empty(((count + sample_step - 1) // sample_step, 2), dtype=np.float64)
+    seen = 0
+    n = 0
+    for y in range(height):
+        for x in range(width):
+            if binary[y, x] > 0:
+                if seen % sample_step == 0:
+                    px = float(x)
+                    py = float(y)
+                    if normalize:
+                        px = (px / (width - 1)) * 2 - 1 if width > 1 else 0.0
+                        py = (py / (height - 1)) * 2 - 1 if height > 1 else 0.0
+                    points[n, 0] = px
+                    points[n, 1] = py
+                    n += 1
+                seen += 1
 
     return points
 
@@ -106,6 +145,7 @@ def extract_plot_points(
 def create_plot_grid(
     binary_image: np.ndarray,
     grid_resolution: int = 256,
+    dtype: type = np.float32,
 ) -> np.ndarray:
     """
     Create a normalized 2D grid of hit/miss values for mesh mapping.
@@ -115,21 +155,27 @@ def create_plot_grid(
     Args:
         binary_image: Binary image from threshold_image()
         grid_resolution: Target grid size (e.g., 256x256)
+        dtype: Float dtype of the normalized grid, or np.uint8 to keep the
+            quantized [0, 255] grid (a quarter of the float32 footprint)
 
     Returns:
-        Float grid [0.0, 1.0] where 1.0 = line pixel
+        Float grid [0.0, 1.0] where 1.0 = line pixel (uint8 [0, 255] for np.uint8)
     """
-    # Resize to target resolution
+    # Resize to target resolution; when shrinking, area interpolation averages
+    # every covered pixel, so lines thinner than a grid cell are not skipped
+    height, width = binary_image.shape[:2]
+    shrinking = grid_resolution < height and grid_resolution < width
     resized = cv2.resize(
         binary_image,
         (grid_resolution, grid_resolution),
-        interpolation=cv2.INTER_LINEAR,
+        interpolation=cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR,
     )
 
-    # Normalize to [0, 1] range
-    grid = resized.astype(np.float32) / 255.0
+    if np.dtype(dtype) == np.uint8:
+        return resized
 
-    return grid
+    # Normalize to [0, 1] range (converted and scaled in one pass)
+    return np.divide(resized, 255, dtype=dtype)
 
 
 def apply_distance_falloff(
@@ -155,7 +201,10 @@ def apply_distance_falloff(
     # Distance transform gives distance from each pixel to nearest 0 pixel
     distance = cv2.distanceTransform(inverted, cv2.DIST_L2, 5)
 
-    # Normalize and invert: pixels on lines = 1.0, falloff to 0.0
-    normalized = 1.0 - np.clip(distance / falloff_radius, 0.0, 1.0)
+    # Normalize and invert in place: pixels on lines = 1.0, falloff to 0.0
+    # (distances are >= 0, so truncating at the radius is the only clip needed)
+    cv2.threshold(distance, falloff_radius, 0, cv2.THRESH_TRUNC, dst=distance)
+    distance *= np.float32(-1.0 / falloff_radius)
+    distance += np.float32(1.0)
 
-    return normalized.astype(np.float32)
+    return distance
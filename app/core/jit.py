@@ -0,0 +1,60 @@
+"""Optional Numba JIT support.
+
+Numba is an optional accelerator (``pip install -e ".[accel]"``). Kernels
+decorated with :func:`njit` are only compiled when Numba is importable;
+callers check :data:`HAS_NUMBA` and fall back to their NumPy/Python path
+otherwise.
+"""
+
+try:
+    from numba import njit, prange
+
+    HAS_NUMBA = True
+except ImportError:  # pragma: no cover - optional accelerator
+    HAS_NUMBA = False
+
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for ``numba.njit`` when Numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+def warmup_kernels() -> None:
+    """
+    Compile (or load from the on-disk cache) every Numba kernel up front.
+
+    Each kernel is reached through its public entry point with a tiny input
+    of the same dtypes real callers pass, so the specializations compiled
+    here are the ones later calls dispatch to. Does nothing without Numba.
+    """
+    if not HAS_NUMBA:
+        return
+
+    import numpy as np
+
+    from app.core.geometry3d.transformations import apply_subdivision
+    from app.core.geometry3d.vertex_mapper import generate_relief_mesh
+    from app.core.image_analysis.peaks import count_peaks
+    from app.core.image_analysis.tracer import extract_plot_points
+    from app.core.point_extraction import _nms_keep_indices
+
+    extract_plot_points(np.zeros((4, 4), dtype=np.uint8))
+    count_peaks(np.array([0.0, 1.0, 0.0, 1.0, 0.0]), height=0.5, distance=2)
+
+    mesh = generate_relief_mesh(
+        np.zeros((4, 4), dtype=np.float32), resolution=4, smoothing_method="bilinear"
+    )
+    apply_subdivision(mesh["vertices"], mesh["faces"])
+
+    coords = np.zeros(2)
+    _nms_keep_indices(coords, coords, np.ones(2), 1.0)
+
+
+__all__ = ["HAS_NUMBA", "njit", "prange", "warmup_kernels"]
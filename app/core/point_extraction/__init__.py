@@ -1,9 +1,20 @@
 """Point extraction module."""
 
+import asyncio
+
 import cv2
 import numpy as np
+from scipy.spatial import cKDTree
 from typing import Any
 
+from app.core.jit import HAS_NUMBA, njit
+
+# Candidate feature types, indexed by the int8 type ids used during extraction
+_FEATURE_TYPES = ("edge", "corner", "intersection", "symmetry_center", "radial")
+
+# Intensity difference a FAST corner must exceed around its circle (OpenCV's default)
+_FAST_THRESHOLD = 10
+
 
 async def extract_points(
     image_path: str,
@@ -43,153 +54,277 @@ async def extract_points(
     preprocessed = preprocess_image(img)
     height, width = preprocessed.shape[:2]
     
-    # Edge detection
-    edges = detect_edges(preprocessed, 50, 150)
-    
-    # Collect candidate points with weights
-    candidates: list[dict] = []
+    # Edge detection, the rotation center and corners only read the
+    # preprocessed image; run them in worker threads (OpenCV releases the GIL)
+    edges, center, corners = await asyncio.gather(
+        asyncio.to_thread(detect_edges, preprocessed, 50, 150),
+        asyncio.to_thread(find_center_of_rotation, preprocessed),
+        asyncio.to_thread(_detect_corners, preprocessed, int(200 * density)),
+    )
     
-    # 1. Edge contour points
-    contours, _ = cv2.findContours(edges, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    # Contour sampling, intersections and radial sampling are independent too
+    contour_points, intersections, radial_points = await asyncio.gather(
+        asyncio.to_thread(_sample_contour_points, edges, density),
+        asyncio.to_thread(detect_edge_intersections, edges, min_distance),
+        asyncio.to_thread(_sample_radial_points, preprocessed, center, int(50 * density)),
+    )
     
-    for contour in contours:
-        # Sample points along contour based on density
-        total_points = len(contour)
-        step = max(1, int(total_points / (10 * density)))
-        
-        for i in range(0, total_points, step):
-            point = contour[i][0]
-            candidates.append({
-                "x": float(point[0]),
-                "y": float(point[1]),
-                "weight": weight_edges,
-                "feature_type": "edge",
-            })
-    
-    # 2. Corner points (high importance)
-    corners = cv2.goodFeaturesToTrack(
-        preprocessed,
-        maxCorners=int(200 * density),
-        qualityLevel=0.01,
-        minDistance=min_distance,
+    # Candidate sources as ((N, 2) points, weight), indexed like _FEATURE_TYPES
+    sources = (
+        # 1. Edge contour points
+        (contour_points, weight_edges),
+        # 2. Corner points (high importance): corners are high-value edges
+        (corners, weight_edges * 1.5),
+        # 3. Intersection points
+        (np.asarray(intersections).reshape(-1, 2), weight_intersections),
+        # 4. Symmetry center point: center is very important
+        (np.array([center]), weight_symmetry * 2),
+        # 5. Radial sample points (if pattern has rotational symmetry)
+        (radial_points, weight_symmetry),
     )
     
-    if corners is not None:
-        for corner in corners:
-            x, y = corner.ravel()
-            candidates.append({
-                "x": float(x),
-                "y": float(y),
-                "weight": weight_edges * 1.5,  # Corners are high-value edges
-                "feature_type": "corner",
-            })
-    
-    # 3. Intersection points
-    intersections = detect_edge_intersections(edges, min_distance)
-    for x, y in intersections:
-        candidates.append({
-            "x": float(x),
-            "y": float(y),
-            "weight": weight_intersections,
-            "feature_type": "intersection",
-        })
-    
-    # 4. Symmetry center point
-    center = find_center_of_rotation(preprocessed)
-    candidates.append({
-        "x": float(center[0]),
-        "y": float(center[1]),
-        "weight": weight_symmetry * 2,  # Center is very important
-        "feature_type": "symmetry_center",
-    })
-    
-    # 5. Radial sample points (if pattern has rotational symmetry)
-    radial_points = _sample_radial_points(preprocessed, center, int(50 * density))
-    for x, y in radial_points:
-        candidates.append({
-            "x": float(x),
-            "y": float(y),
-            "weight": weight_symmetry,
-            "feature_type": "radial",
-        })
+    # Fill candidate columns (SoA); dicts are only built for the points that
+    # survive suppression
+    num_candidates = sum(len(points) for points, _ in sources)
+    xs = np.empty(num_candidates, dtype=np.float64)
+    ys = np.empty(num_candidates, dtype=np.float64)
+    weights = np.empty(num_candidates, dtype=np.float64)
+    type_ids = np.empty(num_candidates, dtype=np.int8)
+    
+    n = 0
+    for type_id, (points, weight) in enumerate(sources):
+        end = n + len(points)
+        xs[n:end] = points[:, 0]
+        ys[n:end] = points[:, 1]
+        weights[n:end] = weight
+        type_ids[n:end] = type_id
+        n = end
     
     # Apply threshold - filter by weight
-    max_weight = max(c["weight"] for c in candidates) if candidates else 1
-    threshold_value = threshold * max_weight
-    filtered = [c for c in candidates if c["weight"] >= threshold_value]
+    threshold_value = threshold * weights.max()
+    keep = np.flatnonzero(weights >= threshold_value)
+    xs, ys, weights, type_ids = xs[keep], ys[keep], weights[keep], type_ids[keep]
+    
+    # Apply minimum distance constraint using non-maximum suppression; survivors
+    # come back by weight descending, so suppression can stop as soon as
+    # max_points are kept (lower-weight candidates could only be trimmed)
+    max_keep = max_points if max_points is not None and max_points >= 0 else None
     
-    # Apply minimum distance constraint using non-maximum suppression
-    final_points = _non_max_suppression(filtered, min_distance)
+    # Weights are constant per feature type, so the weight-descending visiting
+    # order is a stable sort of int8 per-type ranks (a linear radix sort)
+    # rather than a comparison sort of every float weight
+    type_weights = np.array([weight for _, weight in sources], dtype=np.float64)
+    type_rank = np.empty(len(sources), dtype=np.int8)
+    type_rank[np.argsort(-type_weights, kind="stable")] = np.arange(len(sources))
+    order = np.argsort(type_rank[type_ids], kind="stable")
     
-    # Limit to max_points, prioritizing by weight
-    final_points.sort(key=lambda p: p["weight"], reverse=True)
-    final_points = final_points[:max_points]
+    selected = _nms_keep_indices(
+        xs, ys, weights, min_distance, max_keep, order=order
+    )[:max_points]
+    
+    if not selected:
+        return []
     
     # Normalize weights to [0, 1]
-    if final_points:
-        max_w = max(p["weight"] for p in final_points)
-        for p in final_points:
-            p["weight"] = round(p["weight"] / max_w, 3)
+    max_w = weights[selected[0]]
+    
+    return [
+        {
+            "x": x,
+            "y": y,
+            "weight": round(w / max_w, 3),
+            "feature_type": _FEATURE_TYPES[t],
+        }
+        for x, y, w, t in zip(
+            xs[selected].tolist(),
+            ys[selected].tolist(),
+            weights[selected].tolist(),
+            type_ids[selected].tolist(),
+        )
+    ]
+
+
+def _detect_corners(image: np.ndarray, max_corners: int) -> np.ndarray:
+    """
+    Detect FAST corners, strongest first, as an (N, 2) array of (x, y).
+    
+    Args:
+        image: Grayscale uint8 image
+        max_corners: Maximum number of corners to keep (<= 0 keeps all)
+    """
+    detector = cv2.FastFeatureDetector_create(threshold=_FAST_THRESHOLD, nonmaxSuppression=True)
+    keypoints = detector.detect(image)
+    
+    if not keypoints:
+        return np.empty((0, 2), dtype=np.float32)
     
-    return final_points
+    points = cv2.KeyPoint_convert(keypoints)
+    responses = np.array([kp.response for kp in keypoints], dtype=np.float32)
+    order = np.argsort(-responses, kind="stable")
+    if max_corners > 0:
+        order = order[:max_corners]
+    
+    return points[order]
+
+
+def _sample_contour_points(edges: np.ndarray, density: float) -> np.ndarray:
+    """Sample points along each edge contour based on density, as an (N, 2) array of (x, y)."""
+    contours, _ = cv2.findContours(edges, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    
+    if not contours:
+        return np.empty((0, 2), dtype=np.int32)
+    
+    return np.concatenate([
+        contour[::max(1, int(len(contour) / (10 * density))), 0, :]
+        for contour in contours
+    ])
 
 
 def _sample_radial_points(
     image: np.ndarray,
     center: tuple[float, float],
     num_points: int,
-) -> list[tuple[float, float]]:
-    """Sample points along radial lines from center."""
+) -> np.ndarray:
+    """Sample points along radial lines from center, as an (N, 2) array of (x, y)."""
     height, width = image.shape[:2]
     cx, cy = center
     
     max_radius = min(cx, cy, width - cx, height - cy) * 0.9
     if max_radius < 20:
-        return []
+        return np.empty((0, 2), dtype=np.float64)
     
-    points = []
     num_angles = max(8, int(num_points / 5))
     points_per_ray = max(3, num_points // num_angles)
     
-    for i in range(num_angles):
-        angle = 2 * np.pi * i / num_angles
-        
-        for j in range(points_per_ray):
-            r = max_radius * (j + 1) / points_per_ray
-            x = cx + r * np.cos(angle)
-            y = cy + r * np.sin(angle)
-            
-            if 0 <= x < width and 0 <= y < height:
-                points.append((x, y))
-    
-    return points
-
-
-def _non_max_suppression(
-    points: list[dict],
-    min_distance: int,
-) -> list[dict]:
-    """Apply non-maximum suppression to enforce minimum distance."""
-    if not points:
-        return []
+    # One row per ray, one column per sample along it
+    angles = 2 * np.pi * np.arange(num_angles) / num_angles
+    radii = max_radius * np.arange(1, points_per_ray + 1) / points_per_ray
+    xs = (cx + np.outer(np.cos(angles), radii)).ravel()
+    ys = (cy + np.outer(np.sin(angles), radii)).ravel()
     
-    # Sort by weight descending
-    sorted_points = sorted(points, key=lambda p: p["weight"], reverse=True)
-    
-    selected = []
-    for point in sorted_points:
-        # Check distance to all selected points
-        is_far_enough = True
-        for selected_point in selected:
-            dx = point["x"] - selected_point["x"]
-            dy = point["y"] - selected_point["y"]
-            distance = np.sqrt(dx**2 + dy**2)
-            
-            if distance < min_distance:
-                is_far_enough = False
-                break
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    return np.column_stack((xs[inside], ys[inside]))
+
+
+def _nms_keep_indices(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    weights: np.ndarray,
+    min_distance: float,
+    max_keep: int | None = None,
+    order: np.ndarray | None = None,
+) -> list[int]:
+    """
+    Greedy non-maximum suppression over point arrays.
+    
+    Visits points by weight descending (stable for equal weights) and keeps a
+    point unless an already kept point lies closer than min_distance. With
+    Numba, each point is only checked against kept points in its own and the
+    adjacent grid cells; otherwise kept points query a KD-tree for their
+    neighbours. Stops once max_keep points are kept, if given. `order` is a
+    precomputed visiting order equal to that weight sort, if the caller
+    has a cheaper way to produce it.
+    
+    Returns:
+        Indices of the kept points, highest weight first
+    """
+    if order is None:
+        order = np.argsort(-weights, kind="stable")
+    if min_distance <= 0 or len(order) == 0:
+        return order[:max_keep].tolist()
+    
+    if HAS_NUMBA:
+        return _nms_grid_jit(
+            np.ascontiguousarray(xs, dtype=np.float64),
+            np.ascontiguousarray(ys, dtype=np.float64),
+            order,
+            float(min_distance),
+            -1 if max_keep is None else max_keep,
+        ).tolist()
+    
+    tree = cKDTree(np.column_stack((xs, ys)))
+    suppressed = np.zeros(len(xs), dtype=bool)
+    
+    keep = []
+    for i in order.tolist():
+        if max_keep is not None and len(keep) >= max_keep:
+            break
+        if suppressed[i]:
+            continue
+        keep.append(i)
         
-        if is_far_enough:
-            selected.append(point)
+        # The ball query is inclusive; re-check with the strict distance test
+        neighbours = np.asarray(
+            tree.query_ball_point((xs[i], ys[i]), r=min_distance), dtype=np.intp
+        )
+        dx = xs[neighbours] - xs[i]
+        dy = ys[neighbours] - ys[i]
+        suppressed[neighbours[np.sqrt(dx**2 + dy**2) < min_distance]] = True
     
-    return selected
+    return keep
+
+
+@njit(cache=True)
+def _nms_grid_jit(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    order: np.ndarray,
+    min_distance: float,
+    max_keep: int,
+) -> np.ndarray:
+    """
+    Greedy NMS in visiting order, bucketing kept points into a uniform grid.
+
+    A negative max_keep means no limit.
+    """
+    n = order.shape[0]
+    x0 = xs.min()
+    y0 = ys.min()
+    extent = max(xs.max() - x0, ys.max() - y0)
+
+    # Cells at least min_distance wide (with headroom for rounding), so any
+    # point closer than min_distance sits in one of the 3x3 surrounding cells;
+    # widened further if needed to cap the grid at 1024x1024 cells
+    cell = max(min_distance * (1.0 + 1e-6), extent / 1024.0)
+    grid_w = int((xs.max() - x0) / cell) + 1
+    grid_h = int((ys.max() - y0) / cell) + 1
+
+    # Kept points per cell as singly linked lists
+    head = np.full(grid_w * grid_h, -1, dtype=np.intp)
+    next_kept = np.full(xs.shape[0], -1, dtype=np.intp)
+
+    keep = np.empty(n, dtype=np.intp)
+    num_kept = 0
+
+    for idx in range(n):
+        if num_kept == max_keep:
+            break
+
+        i = order[idx]
+        gx = int((xs[i] - x0) / cell)
+        gy = int((ys[i] - y0) / cell)
+
+        suppressed = False
+        for ny in range(max(gy - 1, 0), min(gy + 2, grid_h)):
+            for nx in range(max(gx - 1, 0), min(gx + 2, grid_w)):
+                k = head[ny * grid_w + nx]
+                while k != -1:
+                    dx = xs[i] - xs[k]
+                    dy = ys[i] - ys[k]
+                    if np.sqrt(dx * dx + dy * dy) < min_distance:
+                        suppressed = True
+                        break
+                    k = next_kept[k]
+                if suppressed:
+                    break
+            if suppressed:
+                break
+
+        if not suppressed:
+            c = gy * grid_w + gx
+            next_kept[i] = head[c]
+            head[c] = i
+            keep[num_kept] = i
+            num_kept += 1
+
+    return keep[:num_kept]
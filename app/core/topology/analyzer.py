@@ -4,15 +4,51 @@ Based on image features (symmetry, geometry), maps a 2D pattern
 to a target 3D manifold family with a confidence score.
 """
 
+import logging
+
 import cv2
 import numpy as np
-from typing import Tuple, Dict, Any
+from scipy.ndimage import gaussian_filter1d
+from scipy.signal import find_peaks
+from typing import Tuple, Dict, Any, Union
 
 from app.core.topology.intent import TopologyFamily, SteeringProfile, PhaseBehavior
 from app.core.image_analysis import symmetry
 from app.core.image_analysis import geometry_extractor
 from app.core.image_analysis import preprocessor
 
+logger = logging.getLogger(__name__)
+
+
+# Longest image side used for feature extraction; larger inputs are downscaled
+_ANALYSIS_MAX_SIDE = 512
+
+
+def _rescale_features(
+    sym_result: Dict[str, Any],
+    geo_result: Dict[str, Any],
+    circles: list,
+    factor: float,
+) -> list:
+    """Scale positions and radii found at analysis resolution by factor, in place.
+
+    Returns the rescaled concentric circles (radii, or [x, y, r] Hough entries).
+    """
+    center = sym_result.get("rotational_center")
+    if center is not None:
+        sym_result["rotational_center"] = (center[0] * factor, center[1] * factor)
+
+    cx, cy = geo_result["centroid"]
+    geo_result["centroid"] = (cx * factor, cy * factor)
+    geo_result["bounding_box"] = tuple(round(v * factor) for v in geo_result["bounding_box"])
+    if geo_result["estimated_radius"] is not None:
+        geo_result["estimated_radius"] *= factor
+
+    return [
+        [v * factor for v in circle] if isinstance(circle, list) else circle * factor
+        for circle in circles
+    ]
+
 
 class TopologyAnalyzer:
     """
@@ -23,7 +59,7 @@ class TopologyAnalyzer:
         pass
 
     def analyze(
-        self, input_obj, steering: SteeringProfile = None
+        self, input_obj: Union[str, np.ndarray], steering: SteeringProfile = None
     ) -> Tuple[TopologyFamily, float]:
         """
         Analyze an image or array and determine the best fit topology family.
@@ -74,12 +110,34 @@ class TopologyAnalyzer:
 
         except Exception as e:
             # Fallback on error
-            print(f"Analysis error: {e}")
+            logger.warning("Analysis error: %s", e)
             return TopologyFamily.PLANAR_RELIEF, 0.0
 
         # 3. Extract Features
         features = self._extract_features(img)
 
+        return self.classify(features, steering)
+
+    def classify(
+        self, features: Dict[str, Any], steering: SteeringProfile = None
+    ) -> Tuple[TopologyFamily, float]:
+        """
+        Pick the best fit topology family for already extracted features.
+
+        Lets callers that inspect the features (e.g. for debugging) reuse
+        them instead of re-running the image analysis. `force_family` is
+        handled by :meth:`analyze` before any features are extracted.
+
+        Args:
+            features: Result of :meth:`_extract_features`.
+            steering: Optional steering profile constraining the allowed families.
+
+        Returns:
+            Tuple of (TopologyFamily, confidence_score [0.0 - 1.0]).
+        """
+        if steering is None:
+            steering = SteeringProfile()
+
         # Quick heuristics override: concentric circles -> TOROIDAL (require 3+ peaks to avoid noise)
         if features.get("concentric_circles") and len(features.get("concentric_circles", [])) >= 3:
             return TopologyFamily.TOROIDAL, 0.8
@@ -125,9 +183,23 @@ class TopologyAnalyzer:
 
     def _extract_features(self, img: np.ndarray) -> Dict[str, Any]:
         """Run standard image analysis tools."""
+        img_shape = img.shape
+
+        # The heuristics are scale-robust, so large images are analyzed at a
+        # bounded resolution; positions and radii are scaled back at the end
+        img, scale = preprocessor.downsample_to_max_side(img, _ANALYSIS_MAX_SIDE)
+
+        # Ensure uint8 for edge detection (single min-max scaling pass in OpenCV)
+        if img.dtype != np.uint8:
+            img_u8 = cv2.normalize(img, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
+        else:
+            img_u8 = img
+
+        # Content centroid, shared by the symmetry and geometry analyses
+        content_center = symmetry.find_center_of_rotation(img_u8)
 
         # Symmetry Analysis
-        sym_result = symmetry.detect_symmetry(img)
+        sym_result = symmetry.detect_symmetry(img, content_center=content_center)
 
         # Radial Analysis
         center = sym_result.get("rotational_center")
@@ -137,17 +209,15 @@ class TopologyAnalyzer:
         radial_result = symmetry.detect_radial_pattern(img, center)
 
         # Geometric Analysis (requires "edges_result" usually, we'll mock or compute minimum)
-        # Ensure uint8 for edge detection
-        if img.dtype != np.uint8:
-            img_u8 = (img / img.max() * 255).astype(np.uint8) if img.max() > 1 else (img * 255).astype(np.uint8)
-        else:
-            img_u8 = img
         edges = cv2.Canny(img_u8, 50, 150)
         edges_result = {
             "edge_density": np.count_nonzero(edges) / edges.size,
             "dominant_angles": [],  # Simplified for now
+            "canny_edges": edges,  # Reused by the radius estimate
         }
-        geo_result = geometry_extractor.extract_geometry(img_u8, edges_result)
+        geo_result = geometry_extractor.extract_geometry(
+            img_u8, edges_result, centroid=content_center
+        )
 
         # Concentric Circles: prefer geometry_extractor result but try HoughCircles then radial peaks as fallback
         circles = geometry_extractor.find_concentric_circles(img, center)
@@ -173,32 +243,38 @@ class TopologyAnalyzer:
         if not circles:
             # quick radial peak detection on a downsampled grid
             try:
-                from scipy.signal import find_peaks
                 h, w = img.shape
                 cy, cx = int(h / 2), int(w / 2)
-                y, x = np.indices(img.shape)
-                r = np.sqrt((x - cx) ** 2 + (y - cy) ** 2)
+                y, x = np.ogrid[:h, :w]
+                r = preprocessor.radial_distances(x, y, (cx, cy))
                 maxr = int(r.max())
                 bins = np.linspace(0, maxr, min(128, maxr) + 1)
-                radial = np.zeros(len(bins) - 1)
-                for i in range(len(radial)):
-                    mask = (r >= bins[i]) & (r < bins[i + 1])
-                    if mask.sum() > 0:
-                        radial[i] = img[mask].mean()
+                nbins = len(bins) - 1
+                # Mean intensity per ring in one pass: bin every pixel, then
+                # sum and count per bin (pixels at r >= maxr fall outside)
+                bin_idx = np.searchsorted(bins, r.ravel(), side="right") - 1
+                in_range = bin_idx < nbins
+                bin_idx = bin_idx[in_range]
+                sums = np.bincount(bin_idx, weights=img.ravel()[in_range], minlength=nbins)
+                counts = np.bincount(bin_idx, minlength=nbins)
+                radial = np.divide(sums, counts, out=np.zeros(nbins), where=counts > 0)
                 # smooth
-                from scipy.ndimage import gaussian_filter1d
                 radial_s = gaussian_filter1d(radial, sigma=1)
                 peaks, _ = find_peaks(radial_s, height=radial_s.mean() + radial_s.std() * 0.25, distance=3)
-                circles = [float(p) for p in peaks]
+                # Peaks are bin indices; report them as radii like the other detectors
+                circles = bins[peaks].tolist()
             except Exception:
                 circles = []
 
+        if scale != 1.0:
+            circles = _rescale_features(sym_result, geo_result, circles, 1.0 / scale)
+
         return {
             "symmetry": sym_result,
             "radial": radial_result,
             "geometry": geo_result,
             "concentric_circles": circles,
-            "img_shape": img.shape,
+            "img_shape": img_shape,
         }
 
     def _score_toroidal(self, features: Dict[str, Any]) -> float:
@@ -81,24 +81,24 @@ class SteeringProfile(BaseModel):
     boundary_condition: BoundaryCondition = Field(default=BoundaryCondition.CLOSED_LOOP)
     dimensionality: Dimensionality = Field(default=Dimensionality.DIM_3D)
 
+    # The enums are str subclasses, so members compare (and hash) equal to their
+    # values: plain membership works whether use_enum_values already stored
+    # strings or the unvalidated defaults still hold members
     @field_validator("force_family", mode="after")
     @classmethod
     def force_family_must_be_allowed(cls, v, info):
-        if v is not None and "allowed_families" in info.data:
-            allowed = info.data.get("allowed_families", [])
-            allowed_values = {a.value if isinstance(a, TopologyFamily) else str(a) for a in allowed}
-            v_value = v.value if isinstance(v, TopologyFamily) else str(v)
-            if v_value not in allowed_values:
-                raise ValueError("force_family must be in allowed_families")
+        allowed = info.data.get("allowed_families")
+        if v is not None and allowed is not None and v not in allowed:
+            raise ValueError("force_family must be in allowed_families")
         return v
 
     @model_validator(mode="after")
     def check_orientation_conflicts(self):
-        if self.force_family is not None and self.orientation_rule is not None:
-            ff_val = self.force_family.value if isinstance(self.force_family, TopologyFamily) else str(self.force_family)
-            or_val = self.orientation_rule.value if isinstance(self.orientation_rule, OrientationRule) else str(self.orientation_rule)
-            if ff_val == TopologyFamily.KLEIN_BOTTLE.value and or_val == OrientationRule.PRESERVE.value:
-                raise ValueError("KLEIN_BOTTLE cannot be produced when orientation_rule == PRESERVE")
+        if (
+            self.force_family == TopologyFamily.KLEIN_BOTTLE
+            and self.orientation_rule == OrientationRule.PRESERVE
+        ):
+            raise ValueError("KLEIN_BOTTLE cannot be produced when orientation_rule == PRESERVE")
         return self
 
     # Legacy config class removed; use model_config above
@@ -1,6 +1,7 @@
 """FastAPI application entry point."""
 
 import asyncio
+import logging
 import sys
 
 if sys.platform == "win32":
@@ -13,27 +14,36 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
+from app.core.jit import warmup_kernels
 
 settings = get_settings()
 
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan context manager for startup/shutdown events."""
     # Startup
     settings.ensure_storage_dirs()
-    print(f"🚀 {settings.app_name} starting up...")
-    print(f"   Environment: {settings.app_env}")
-    print(f"   Debug: {settings.debug}")
+    logger.info("🚀 %s starting up...", settings.app_name)
+    logger.info("   Environment: %s", settings.app_env)
+    logger.info("   Debug: %s", settings.debug)
+
+    # Pay Numba compilation (or cache loading) before the first request does
+    await asyncio.to_thread(warmup_kernels)
 
     yield
 
     # Shutdown
-    print(f"👋 {settings.app_name} shutting down...")
+    logger.info("👋 %s shutting down...", settings.app_name)
 
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
+    # Startup/shutdown notices are informational; production only logs warnings and up
+    logging.basicConfig(level=logging.INFO if settings.debug else logging.WARNING)
+
     app = FastAPI(
         title=settings.app_name,
         description="Geometric Pattern to 3D Transformation API",
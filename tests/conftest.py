@@ -7,21 +7,57 @@ import tempfile
 import cv2
 
 
+def _circle_pattern() -> np.ndarray:
+    """Draw the simple concentric-circle pattern used as the default sample."""
+    img = np.zeros((256, 256), dtype=np.uint8)
+    cv2.circle(img, (128, 128), 50, 255, 2)
+    cv2.circle(img, (128, 128), 80, 255, 2)
+    cv2.circle(img, (128, 128), 110, 255, 2)
+    return img
+
+
 @pytest.fixture
 def sample_image_path():
     """Create a sample geometric pattern image for testing."""
     with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
         # Create a simple circular pattern
-        img = np.zeros((256, 256), dtype=np.uint8)
-        cv2.circle(img, (128, 128), 50, 255, 2)
-        cv2.circle(img, (128, 128), 80, 255, 2)
-        cv2.circle(img, (128, 128), 110, 255, 2)
-        cv2.imwrite(f.name, img)
+        cv2.imwrite(f.name, _circle_pattern())
         yield f.name
     # Cleanup
     Path(f.name).unlink(missing_ok=True)
 
 
+@pytest.fixture(scope="session")
+def preprocessed_sample(tmp_path_factory):
+    """Read and preprocess the sample pattern once per session.
+    
+    Returns a read-only (grayscale image, preprocessed image) tuple.
+    """
+    from app.core.image_analysis.preprocessor import preprocess_image
+    
+    path = tmp_path_factory.mktemp("samples") / "circles.png"
+    cv2.imwrite(str(path), _circle_pattern())
+    
+    img = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+    preprocessed = preprocess_image(img)
+    
+    img.flags.writeable = False
+    preprocessed.flags.writeable = False
+    return img, preprocessed
+
+
+@pytest.fixture(scope="session")
+def default_edges(preprocessed_sample):
+    """Read-only default (combined, 50/150) edge map of the preprocessed sample."""
+    from app.core.image_analysis.edge_detection import detect_edges
+    
+    _, preprocessed = preprocessed_sample
+    edges = detect_edges(preprocessed, 50, 150)
+    
+    edges.flags.writeable = False
+    return edges
+
+
 @pytest.fixture
 def sample_spiral_image_path():
     """Create a sample spiral pattern image for testing."""
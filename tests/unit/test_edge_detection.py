@@ -1,67 +1,46 @@
 """Unit tests for edge detection."""
 
+from collections import OrderedDict
+
 import pytest
 import numpy as np
 import cv2
 
+import app.core.image_analysis as image_analysis
+from app.core.image_analysis.edge_detection import (
+    compute_edge_metrics,
+    detect_edge_intersections,
+    detect_edges,
+    find_contour_hierarchy,
+)
+from app.core.image_analysis.preprocessor import (
+    apply_morphological_cleanup,
+    preprocess_image,
+    resize_for_processing,
+)
+
 
+@pytest.mark.xdist_group("edge")
 class TestEdgeDetection:
     """Test edge detection algorithms."""
     
-    def test_detect_edges_canny(self, sample_image_path):
-        """Test Canny edge detection."""
-        from app.core.image_analysis.edge_detection import detect_edges
-        from app.core.image_analysis.preprocessor import preprocess_image
-        
-        img = cv2.imread(sample_image_path, cv2.IMREAD_GRAYSCALE)
-        preprocessed = preprocess_image(img)
+    @pytest.mark.parametrize("method", ["canny", "sobel", "combined"])
+    def test_detect_edges(self, preprocessed_sample, method):
+        """Test Canny, Sobel and combined edge detection."""
+        img, preprocessed = preprocessed_sample
         
-        edges = detect_edges(preprocessed, 50, 150, method="canny")
+        edges = detect_edges(preprocessed, 50, 150, method=method)
         
         assert edges is not None
         assert edges.shape == img.shape
         assert edges.dtype == np.uint8
         assert np.max(edges) > 0  # Should have some edges
     
-    def test_detect_edges_sobel(self, sample_image_path):
-        """Test Sobel edge detection."""
-        from app.core.image_analysis.edge_detection import detect_edges
-        from app.core.image_analysis.preprocessor import preprocess_image
-        
-        img = cv2.imread(sample_image_path, cv2.IMREAD_GRAYSCALE)
-        preprocessed = preprocess_image(img)
-        
-        edges = detect_edges(preprocessed, 50, 150, method="sobel")
-        
-        assert edges is not None
-        assert edges.shape == img.shape
-        assert np.max(edges) > 0
-    
-    def test_detect_edges_combined(self, sample_image_path):
-        """Test combined edge detection."""
-        from app.core.image_analysis.edge_detection import detect_edges
-        from app.core.image_analysis.preprocessor import preprocess_image
-        
-        img = cv2.imread(sample_image_path, cv2.IMREAD_GRAYSCALE)
-        preprocessed = preprocess_image(img)
-        
-        edges = detect_edges(preprocessed, 50, 150, method="combined")
-        
-        assert edges is not None
-        assert np.max(edges) > 0
-    
-    def test_compute_edge_metrics(self, sample_image_path):
+    def test_compute_edge_metrics(self, preprocessed_sample, default_edges):
         """Test edge metrics computation."""
-        from app.core.image_analysis.edge_detection import (
-            detect_edges, compute_edge_metrics
-        )
-        from app.core.image_analysis.preprocessor import preprocess_image
-        
-        img = cv2.imread(sample_image_path, cv2.IMREAD_GRAYSCALE)
-        preprocessed = preprocess_image(img)
-        edges = detect_edges(preprocessed, 50, 150)
+        _, preprocessed = preprocessed_sample
         
-        metrics = compute_edge_metrics(edges, preprocessed)
+        metrics = compute_edge_metrics(default_edges, preprocessed)
         
         assert "edge_count" in metrics
         assert "edge_density" in metrics
@@ -75,11 +54,6 @@ class TestEdgeDetection:
     
     def test_detect_edge_intersections(self, sample_grid_image_path):
         """Test intersection detection on grid pattern."""
-        from app.core.image_analysis.edge_detection import (
-            detect_edges, detect_edge_intersections
-        )
-        from app.core.image_analysis.preprocessor import preprocess_image
-        
         img = cv2.imread(sample_grid_image_path, cv2.IMREAD_GRAYSCALE)
         preprocessed = preprocess_image(img)
         edges = detect_edges(preprocessed, 50, 150)
@@ -90,18 +64,9 @@ class TestEdgeDetection:
         # Grid should have intersections
         # Note: exact count depends on implementation
     
-    def test_find_contour_hierarchy(self, sample_image_path):
+    def test_find_contour_hierarchy(self, default_edges):
         """Test contour hierarchy analysis."""
-        from app.core.image_analysis.edge_detection import (
-            detect_edges, find_contour_hierarchy
-        )
-        from app.core.image_analysis.preprocessor import preprocess_image
-        
-        img = cv2.imread(sample_image_path, cv2.IMREAD_GRAYSCALE)
-        preprocessed = preprocess_image(img)
-        edges = detect_edges(preprocessed, 50, 150)
-        
-        hierarchy = find_contour_hierarchy(edges)
+        hierarchy = find_contour_hierarchy(default_edges)
         
         assert "depth" in hierarchy
         assert "outer_count" in hierarchy
@@ -109,13 +74,12 @@ class TestEdgeDetection:
         assert "total_contours" in hierarchy
 
 
+@pytest.mark.xdist_group("edge")
 class TestPreprocessor:
     """Test image preprocessing."""
     
     def test_preprocess_image(self, sample_image_path):
         """Test basic preprocessing."""
-        from app.core.image_analysis.preprocessor import preprocess_image
-        
         img = cv2.imread(sample_image_path)
         
         preprocessed = preprocess_image(img)
@@ -126,8 +90,6 @@ class TestPreprocessor:
     
     def test_preprocess_with_blur(self, sample_image_path):
         """Test preprocessing with different blur kernel sizes."""
-        from app.core.image_analysis.preprocessor import preprocess_image
-        
         img = cv2.imread(sample_image_path)
         
         result_3 = preprocess_image(img, blur_kernel_size=3)
@@ -138,10 +100,8 @@ class TestPreprocessor:
     
     def test_resize_for_processing(self, sample_image_path):
         """Test image resizing."""
-        from app.core.image_analysis.preprocessor import resize_for_processing
-        
         # Create large image
-        large_img = np.zeros((2000, 2000), dtype=np.uint8)
+        large_img = np.zeros((1500, 1100), dtype=np.uint8)
         
         resized, scale = resize_for_processing(large_img, max_dimension=1024)
         
@@ -150,8 +110,6 @@ class TestPreprocessor:
     
     def test_morphological_cleanup(self, sample_image_path):
         """Test morphological operations."""
-        from app.core.image_analysis.preprocessor import apply_morphological_cleanup
-        
         # Create binary image with noise
         binary = np.zeros((100, 100), dtype=np.uint8)
         binary[40:60, 40:60] = 255
@@ -161,3 +119,59 @@ class TestPreprocessor:
         
         assert cleaned is not None
         # Opening should remove single-pixel noise
+
+
+@pytest.mark.xdist_group("edge")
+class TestEdgeDetectionCache:
+    """Test the bounded edge detection cache of analyze_image."""
+    
+    async def test_cache_evicts_least_recently_used(self, tmp_path, monkeypatch):
+        """Test the cache holds at most its size, evicting the least recently used entry."""
+        monkeypatch.setattr(image_analysis, "_edge_detection_cache", OrderedDict())
+        monkeypatch.setattr(image_analysis, "_EDGE_DETECTION_CACHE_SIZE", 2)
+        cache = image_analysis._edge_detection_cache
+        
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"pattern_{i}.png"
+            img = np.zeros((64, 64), dtype=np.uint8)
+            cv2.circle(img, (32, 32), 8 + 6 * i, 255, 2)
+            cv2.imwrite(str(path), img)
+            paths.append(str(path))
+        
+        await image_analysis.analyze_image(paths[0], detect_symmetry=False, extract_geometry=False)
+        await image_analysis.analyze_image(paths[1], detect_symmetry=False, extract_geometry=False)
+        first_key = next(iter(cache))
+        
+        # Touch the first image again, so the second becomes least recently used
+        await image_analysis.analyze_image(paths[0], detect_symmetry=False, extract_geometry=False)
+        await image_analysis.analyze_image(paths[2], detect_symmetry=False, extract_geometry=False)
+        
+        assert len(cache) == 2
+        assert first_key in cache
+    
+    async def test_cache_hit_is_unaffected_by_mutating_results(self, tmp_path, monkeypatch):
+        """Test mutating a returned edges result does not change later cache hits."""
+        monkeypatch.setattr(image_analysis, "_edge_detection_cache", OrderedDict())
+        path = tmp_path / "pattern.png"
+        img = np.zeros((64, 64), dtype=np.uint8)
+        cv2.circle(img, (32, 32), 16, 255, 2)
+        cv2.imwrite(str(path), img)
+        
+        first = await image_analysis.analyze_image(
+            str(path), detect_symmetry=False, extract_geometry=False
+        )
+        expected_keys = set(first["edges"])
+        first["edges"].pop("contour_count")
+        first["edges"]["edge_density"] = -1.0
+        
+        second = await image_analysis.analyze_image(
+            str(path), detect_symmetry=False, extract_geometry=False
+        )
+        second["edges"].clear()
+        
+        third = await image_analysis.analyze_image(
+            str(path), detect_symmetry=False, extract_geometry=False
+        )
+        assert set(third["edges"]) == expected_keys
+        assert third["edges"]["edge_density"] >= 0
@@ -1,7 +1,33 @@
 """Unit tests for 3D geometry generation."""
 
+import json
+
 import pytest
 import numpy as np
+from scipy.spatial.distance import cdist
+
+from app.core.geometry3d.exporters import export_to_format
+from app.core.geometry3d.mapping import (
+    _sqeuclidean_cdist,
+    map_points_to_surface,
+    project_pattern_to_sphere,
+    project_pattern_to_torus,
+)
+from app.core.geometry3d.primitives import (
+    create_cube,
+    create_helix,
+    create_hexagonal_prism,
+    create_pyramid,
+    create_sphere,
+    create_torus,
+)
+from app.core.geometry3d.transformations import (
+    apply_extrusion,
+    apply_smoothing,
+    apply_subdivision,
+    apply_taper,
+    apply_twist,
+)
 
 
 class TestPrimitives:
@@ -9,8 +35,6 @@ class TestPrimitives:
     
     def test_create_sphere(self):
         """Test sphere generation."""
-        from app.core.geometry3d.primitives import create_sphere
-        
         vertices, faces, normals = create_sphere(radius=1.0, subdivisions=2)
         
         assert len(vertices) > 0
@@ -23,8 +47,6 @@ class TestPrimitives:
     
     def test_create_torus(self):
         """Test torus generation."""
-        from app.core.geometry3d.primitives import create_torus
-        
         vertices, faces, normals = create_torus(
             major_radius=1.0, minor_radius=0.3, segments=16, ring_segments=8
         )
@@ -35,8 +57,6 @@ class TestPrimitives:
     
     def test_create_cube(self):
         """Test cube generation."""
-        from app.core.geometry3d.primitives import create_cube
-        
         vertices, faces, normals = create_cube(size=2.0)
         
         assert len(vertices) == 8
@@ -48,8 +68,6 @@ class TestPrimitives:
     
     def test_create_hexagonal_prism(self):
         """Test hexagonal prism generation."""
-        from app.core.geometry3d.primitives import create_hexagonal_prism
-        
         vertices, faces, normals = create_hexagonal_prism(radius=1.0, height=2.0)
         
         assert len(vertices) > 0
@@ -60,8 +78,6 @@ class TestPrimitives:
     
     def test_create_pyramid(self):
         """Test pyramid generation."""
-        from app.core.geometry3d.primitives import create_pyramid
-        
         vertices, faces, normals = create_pyramid(
             base_radius=1.0, height=2.0, sides=4
         )
@@ -71,8 +87,6 @@ class TestPrimitives:
     
     def test_create_helix(self):
         """Test helix generation."""
-        from app.core.geometry3d.primitives import create_helix
-        
         vertices, faces, normals = create_helix(
             radius=1.0, height=3.0, turns=2,
             tube_radius=0.1, segments_per_turn=16, tube_segments=8
@@ -86,9 +100,9 @@ class TestPrimitives:
 class TestTransformations:
     """Test mesh transformation operations."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def simple_mesh(self):
-        """Create a simple mesh for testing."""
+        """Create a simple read-only mesh with unit vertex normals for testing."""
         vertices = np.array([
             [0, 0, 0],
             [1, 0, 0],
@@ -103,20 +117,22 @@ class TestTransformations:
             [1, 2, 3],
         ])
         
-        return vertices, faces
-    
-    def test_apply_extrusion(self, simple_mesh):
-        """Test extrusion transformation."""
-        from app.core.geometry3d.transformations import apply_extrusion
-        
-        vertices, faces = simple_mesh
         normals = np.array([
             [-1, -1, -1],
             [1, -1, -1],
             [-1, 1, -1],
             [-1, -1, 1],
         ], dtype=np.float64)
-        normals = normals / np.linalg.norm(normals, axis=1, keepdims=True)
+        normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+        
+        for array in (vertices, faces, normals):
+            array.flags.writeable = False
+        
+        return vertices, faces, normals
+    
+    def test_apply_extrusion(self, simple_mesh):
+        """Test extrusion transformation."""
+        vertices, _, normals = simple_mesh
         
         extruded = apply_extrusion(vertices, normals, depth=2.0)
         
@@ -124,11 +140,24 @@ class TestTransformations:
         # Vertices should have moved along normals
         assert not np.allclose(extruded, vertices)
     
+    def test_apply_extrusion_out(self, simple_mesh):
+        """Test extrusion into a preallocated output array."""
+        vertices, _, _ = simple_mesh
+        normals = np.ones_like(vertices) / np.sqrt(3)
+        expected = apply_extrusion(vertices, normals, depth=2.0)
+        
+        out = np.empty_like(vertices)
+        assert apply_extrusion(vertices, normals, depth=2.0, out=out) is out
+        assert np.allclose(out, expected)
+        
+        # Writing back into the input vertices is allowed
+        in_place = vertices.copy()
+        apply_extrusion(in_place, normals, depth=2.0, out=in_place)
+        assert np.allclose(in_place, expected)
+    
     def test_apply_subdivision(self, simple_mesh):
         """Test mesh subdivision."""
-        from app.core.geometry3d.transformations import apply_subdivision
-        
-        vertices, faces = simple_mesh
+        vertices, faces, _ = simple_mesh
         
         new_vertices, new_faces = apply_subdivision(vertices, faces, levels=1)
         
@@ -138,9 +167,7 @@ class TestTransformations:
     
     def test_apply_smoothing(self, simple_mesh):
         """Test Laplacian smoothing."""
-        from app.core.geometry3d.transformations import apply_smoothing
-        
-        vertices, faces = simple_mesh
+        vertices, faces, _ = simple_mesh
         
         smoothed = apply_smoothing(vertices, faces, iterations=3, factor=0.5)
         
@@ -149,9 +176,7 @@ class TestTransformations:
     
     def test_apply_twist(self, simple_mesh):
         """Test twist deformation."""
-        from app.core.geometry3d.transformations import apply_twist
-        
-        vertices, _ = simple_mesh
+        vertices, _, _ = simple_mesh
         
         twisted = apply_twist(vertices, axis="z", angle_per_unit=0.5)
         
@@ -161,9 +186,7 @@ class TestTransformations:
     
     def test_apply_taper(self, simple_mesh):
         """Test taper deformation."""
-        from app.core.geometry3d.transformations import apply_taper
-        
-        vertices, _ = simple_mesh
+        vertices, _, _ = simple_mesh
         
         tapered = apply_taper(
             vertices, axis="z", start_scale=1.0, end_scale=0.5
@@ -175,23 +198,33 @@ class TestTransformations:
 class TestExporters:
     """Test mesh export functionality."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def mesh_data(self):
-        """Create mesh data for export testing."""
-        from app.core.geometry3d.primitives import create_cube
-        
+        """Create mesh data for export testing (built once; exporters only read it)."""
         vertices, faces, normals = create_cube(size=2.0)
         
+        for array in (vertices, faces, normals):
+            array.flags.writeable = False
+        
         return {
-            "vertices": vertices.tolist(),
-            "faces": faces.tolist(),
-            "normals": normals.tolist(),
+            "vertices": vertices,
+            "faces": faces,
+            "normals": normals,
         }
     
+    @pytest.mark.parametrize("format,binary", [
+        ("stl", True), ("stl", False), ("obj", False), ("gltf", False), ("glb", True),
+    ])
+    def test_export_list_input_matches_array_input(self, mesh_data, format, binary):
+        """Test that stored (list) mesh data exports identically to arrays."""
+        as_lists = {key: value.tolist() for key, value in mesh_data.items()}
+        
+        assert export_to_format(as_lists, format, binary=binary) == export_to_format(
+            mesh_data, format, binary=binary
+        )
+    
     def test_export_stl_binary(self, mesh_data):
         """Test binary STL export."""
-        from app.core.geometry3d.exporters import export_to_format
-        
         data = export_to_format(mesh_data, "stl", binary=True)
         
         assert isinstance(data, bytes)
@@ -202,8 +235,6 @@ class TestExporters:
     
     def test_export_stl_ascii(self, mesh_data):
         """Test ASCII STL export."""
-        from app.core.geometry3d.exporters import export_to_format
-        
         data = export_to_format(mesh_data, "stl", binary=False)
         
         assert isinstance(data, bytes)
@@ -213,8 +244,6 @@ class TestExporters:
     
     def test_export_obj(self, mesh_data):
         """Test OBJ export."""
-        from app.core.geometry3d.exporters import export_to_format
-        
         data = export_to_format(mesh_data, "obj")
         
         assert isinstance(data, bytes)
@@ -229,9 +258,6 @@ class TestExporters:
     
     def test_export_gltf(self, mesh_data):
         """Test glTF export."""
-        import json
-        from app.core.geometry3d.exporters import export_to_format
-        
         data = export_to_format(mesh_data, "gltf")
         
         assert isinstance(data, bytes)
@@ -244,8 +270,6 @@ class TestExporters:
     
     def test_export_glb(self, mesh_data):
         """Test GLB binary export."""
-        from app.core.geometry3d.exporters import export_to_format
-        
         data = export_to_format(mesh_data, "glb", binary=True)
         
         assert isinstance(data, bytes)
@@ -260,33 +284,36 @@ class TestMapping:
     
     def test_map_points_to_surface(self, sample_points):
         """Test surface mapping."""
-        from app.core.geometry3d.primitives import create_sphere
-        from app.core.geometry3d.mapping import map_points_to_surface
-        
         vertices, _, _ = create_sphere(radius=1.0, subdivisions=1)
         
         modified = map_points_to_surface(vertices, sample_points, curvature=0.5)
         
         assert modified.shape == vertices.shape
     
+    def test_sqeuclidean_cdist_matches_scipy(self):
+        """Test pairwise distances on 2D pattern points."""
+        rng = np.random.default_rng(0)
+        queries = rng.random((50, 2))
+        points = rng.random((20, 2))
+        
+        distances = _sqeuclidean_cdist(queries, points)
+        
+        assert distances.dtype == np.float64
+        assert np.allclose(distances, cdist(queries, points, "sqeuclidean"), rtol=1e-5)
+    
     def test_project_pattern_to_sphere(self, sample_points):
         """Test spherical projection."""
-        from app.core.geometry3d.mapping import project_pattern_to_sphere
-        
         points_3d = project_pattern_to_sphere(sample_points, radius=1.0)
         
         assert len(points_3d) == len(sample_points)
         
-        for p in points_3d:
-            assert len(p) == 3
-            # All points should be on or near sphere
-            distance = np.sqrt(sum(c**2 for c in p))
-            assert distance <= 1.1  # Allow small tolerance
+        points = np.asarray(points_3d, dtype=np.float64)
+        assert points.shape[1] == 3
+        # All points should be on or near sphere
+        assert (np.linalg.norm(points, axis=1) <= 1.1).all()  # Allow small tolerance
     
     def test_project_pattern_to_torus(self, sample_points):
         """Test toroidal projection."""
-        from app.core.geometry3d.mapping import project_pattern_to_torus
-        
         points_3d = project_pattern_to_torus(
             sample_points, major_radius=1.0, minor_radius=0.3
         )
@@ -0,0 +1,29 @@
+"""Unit tests for peak counting."""
+
+import pytest
+import numpy as np
+from scipy.signal import find_peaks
+
+from app.core.image_analysis.peaks import count_peaks
+
+
+class TestCountPeaks:
+    """Test count_peaks against scipy.signal.find_peaks."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_find_peaks(self, seed):
+        """Test peak counts match find_peaks, including plateaus and ties."""
+        rng = np.random.default_rng(seed)
+        for _ in range(50):
+            # Quantized values produce plateaus and equal-height peaks
+            x = np.round(rng.random(int(rng.integers(3, 400))) * 4) / 4
+            height = float(rng.random())
+            distance = int(rng.integers(1, 30))
+
+            expected = len(find_peaks(x, height=height, distance=distance)[0])
+            assert count_peaks(x, height=height, distance=distance) == expected
+
+    def test_short_signal(self):
+        """Test signals too short to contain a peak."""
+        assert count_peaks(np.array([1.0]), height=0.0, distance=10) == 0
+        assert count_peaks(np.array([0.0, 1.0]), height=0.0, distance=10) == 0
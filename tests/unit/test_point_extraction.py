@@ -0,0 +1,49 @@
+"""Unit tests for point extraction helpers."""
+
+import pytest
+import numpy as np
+
+import app.core.point_extraction as point_extraction
+from app.core.point_extraction import _nms_keep_indices
+
+
+def _brute_force_nms(xs, ys, weights, min_distance):
+    """Reference greedy NMS: compare each point against every kept point."""
+    selected = []
+    for i in sorted(range(len(xs)), key=lambda i: weights[i], reverse=True):
+        if all(np.hypot(xs[i] - xs[k], ys[i] - ys[k]) >= min_distance for k in selected):
+            selected.append(i)
+    return selected
+
+
+class TestNonMaxSuppression:
+    """Test greedy non-maximum suppression."""
+
+    @pytest.mark.parametrize("use_numba", [True, False])
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_brute_force(self, seed, use_numba, monkeypatch):
+        """Test the same points are kept, in the same order, on both paths."""
+        # Run on the Numba grid kernel or on the KD-tree fallback
+        if use_numba and not point_extraction.HAS_NUMBA:
+            pytest.skip("numba not installed")
+        monkeypatch.setattr(point_extraction, "HAS_NUMBA", use_numba)
+
+        rng = np.random.default_rng(seed)
+        # Integer coordinates put many pairs exactly at min_distance
+        xs = rng.integers(0, 100, 300).astype(np.float64)
+        ys = rng.integers(0, 100, 300).astype(np.float64)
+        weights = rng.choice([1.0, 1.2, 1.5], 300)
+
+        for min_distance in (0, 5, 10):
+            result = _nms_keep_indices(xs, ys, weights, min_distance)
+            assert result == _brute_force_nms(xs, ys, weights, min_distance)
+
+    @pytest.mark.parametrize("use_numba", [True, False])
+    def test_empty(self, use_numba, monkeypatch):
+        """Test no points in, no points out."""
+        if use_numba and not point_extraction.HAS_NUMBA:
+            pytest.skip("numba not installed")
+        monkeypatch.setattr(point_extraction, "HAS_NUMBA", use_numba)
+
+        empty = np.empty(0)
+        assert _nms_keep_indices(empty, empty, empty, 10) == []
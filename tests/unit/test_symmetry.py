@@ -0,0 +1,70 @@
+"""Unit tests for symmetry detection."""
+
+import pytest
+import numpy as np
+import cv2
+
+from app.core.image_analysis.symmetry import detect_symmetry
+
+
+def _line_and_disc() -> np.ndarray:
+    image = np.zeros((200, 200), dtype=np.uint8)
+    cv2.line(image, (20, 30), (180, 60), 255, 3)
+    cv2.circle(image, (120, 140), 30, 255, -1)
+    return image
+
+
+def _uneven_grid() -> np.ndarray:
+    image = np.zeros((256, 256), dtype=np.uint8)
+    image[::32, :] = 255
+    image[:, ::24] = 255
+    return image
+
+
+class TestSymmetryScore:
+    """Test the overall symmetry score keeps its [0, 1] scale."""
+
+    @pytest.mark.parametrize(
+        "make_image, expected",
+        [
+            (lambda: np.random.default_rng(0).integers(0, 256, (200, 200), dtype=np.uint8), 0.3036),
+            (_line_and_disc, 0.4755),
+            (_uneven_grid, 0.3),
+        ],
+        ids=["noise", "line_and_disc", "grid"],
+    )
+    def test_asymmetric_scores(self, make_image, expected):
+        """Test uncorrelated images score near 0.3 rather than near 0."""
+        result = detect_symmetry(make_image())
+
+        assert not result["has_rotational"]
+        assert result["reflection_axes"] == []
+        assert result["symmetry_score"] == pytest.approx(expected, abs=1e-3)
+
+    def test_blank_image_scores_zero(self):
+        """Test a zero-variance image gets no rotational credit."""
+        result = detect_symmetry(np.zeros((64, 64), dtype=np.uint8))
+
+        assert result["symmetry_score"] == 0.0
+
+
+class TestReflectionalSymmetry:
+    """Test mirror axis detection."""
+
+    def test_large_thin_rings_have_all_axes(self):
+        """Test thin rings keep every axis after the search downsampling."""
+        image = np.zeros((1200, 1200), dtype=np.uint8)
+        for radius in range(30, 600, 40):
+            cv2.circle(image, (600, 600), radius, 255, 6)
+
+        result = detect_symmetry(image)
+
+        assert result["reflection_axes"] == [0.0, 90.0, 45.0, 135.0]
+
+    def test_diagonal_grid_axis(self):
+        """Test a grid mirrored across the main diagonal has the 135 degree axis."""
+        image = np.zeros((256, 256), dtype=np.uint8)
+        image[::32, :] = 255
+        image[:, ::32] = 255
+
+        assert detect_symmetry(image)["reflection_axes"] == [135.0]
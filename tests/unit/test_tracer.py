@@ -4,14 +4,29 @@ import pytest
 import numpy as np
 import cv2
 
+import app.core.image_analysis.tracer as tracer
+from app.core.image_analysis.tracer import (
+    apply_distance_falloff,
+    create_plot_grid,
+    extract_plot_points,
+    threshold_image,
+)
+
+
+@pytest.fixture(scope="module")
+def square_binary():
+    """Read-only 200x200 binary image with a filled 100x100 square in the middle."""
+    binary = np.zeros((200, 200), dtype=np.uint8)
+    binary[50:150, 50:150] = 255
+    binary.flags.writeable = False
+    return binary
+
 
 class TestThresholdImage:
     """Test image thresholding functions."""
 
     def test_threshold_image_binary(self):
         """Test binary thresholding."""
-        from app.core.image_analysis.tracer import threshold_image
-
         # Create test image with gradient
         img = np.zeros((100, 100), dtype=np.uint8)
         img[:, 50:] = 255  # Right half is white
@@ -27,8 +42,6 @@ class TestThresholdImage:
 
     def test_threshold_image_otsu(self):
         """Test Otsu's thresholding."""
-        from app.core.image_analysis.tracer import threshold_image
-
         # Create bimodal image
         img = np.zeros((100, 100), dtype=np.uint8)
         img[25:75, 25:75] = 200  # Bright center
@@ -40,8 +53,6 @@ class TestThresholdImage:
 
     def test_threshold_image_adaptive(self):
         """Test adaptive thresholding."""
-        from app.core.image_analysis.tracer import threshold_image
-
         # Create image with varying intensity
         img = np.zeros((100, 100), dtype=np.uint8)
         cv2.circle(img, (50, 50), 30, 200, -1)
@@ -53,8 +64,6 @@ class TestThresholdImage:
 
     def test_threshold_image_invert(self):
         """Test image inversion."""
-        from app.core.image_analysis.tracer import threshold_image
-
         img = np.zeros((50, 50), dtype=np.uint8)
         img[10:40, 10:40] = 255
 
@@ -71,8 +80,6 @@ class TestExtractPlotPoints:
 
     def test_extract_plot_points_basic(self):
         """Test basic point extraction."""
-        from app.core.image_analysis.tracer import extract_plot_points
-
         # Create simple binary image with known points
         binary = np.zeros((10, 10), dtype=np.uint8)
         binary[5, 5] = 255
@@ -84,8 +91,6 @@ class TestExtractPlotPoints:
 
     def test_extract_plot_points_normalized(self):
         """Test normalized point extraction."""
-        from app.core.image_analysis.tracer import extract_plot_points
-
         # Create binary image with corners marked
         binary = np.zeros((11, 11), dtype=np.uint8)
         binary[0, 0] = 255  # Top-left
@@ -103,8 +108,6 @@ class TestExtractPlotPoints:
 
     def test_extract_plot_points_empty(self):
         """Test empty image returns no points."""
-        from app.core.image_analysis.tracer import extract_plot_points
-
         binary = np.zeros((10, 10), dtype=np.uint8)
         points = extract_plot_points(binary)
 
@@ -112,8 +115,6 @@ class TestExtractPlotPoints:
 
     def test_extract_plot_points_sampling(self):
         """Test point sampling for performance."""
-        from app.core.image_analysis.tracer import extract_plot_points
-
         # Create image with many points
         binary = np.ones((100, 100), dtype=np.uint8) * 255
 
@@ -122,16 +123,29 @@ class TestExtractPlotPoints:
 
         assert len(sampled) < len(all_points)
 
+    @pytest.mark.parametrize("sample_step", [1, 3])
+    @pytest.mark.parametrize("normalize", [True, False])
+    def test_extract_plot_points_numba_matches_numpy(self, normalize, sample_step, monkeypatch):
+        """Test the Numba scan returns the same points as the NumPy path."""
+        if not tracer.HAS_NUMBA:
+            pytest.skip("numba not installed")
+
+        rng = np.random.default_rng(0)
+        binary = (rng.random((37, 53)) > 0.7).astype(np.uint8) * 255
+
+        jit_points = tracer.extract_plot_points(binary, normalize, sample_step)
+        monkeypatch.setattr(tracer, "HAS_NUMBA", False)
+        numpy_points = tracer.extract_plot_points(binary, normalize, sample_step)
+
+        assert jit_points == numpy_points
+
 
 class TestCreatePlotGrid:
     """Test plot grid creation."""
 
-    def test_create_plot_grid_resize(self):
+    def test_create_plot_grid_resize(self, square_binary):
         """Test grid resizing."""
-        from app.core.image_analysis.tracer import create_plot_grid
-
-        binary = np.zeros((200, 200), dtype=np.uint8)
-        binary[50:150, 50:150] = 255
+        binary = square_binary
 
         grid = create_plot_grid(binary, grid_resolution=64)
 
@@ -140,14 +154,31 @@ class TestCreatePlotGrid:
         assert np.max(grid) <= 1.0
         assert np.min(grid) >= 0.0
 
+    def test_create_plot_grid_keeps_thin_lines(self):
+        """Test a 1-pixel line survives downsampling in every grid column."""
+        binary = np.zeros((1024, 1024), dtype=np.uint8)
+        cv2.line(binary, (0, 100), (1023, 900), 255, 1)
+
+        grid = create_plot_grid(binary, grid_resolution=64)
+
+        assert np.all(grid.max(axis=0) > 0)
+
+    def test_create_plot_grid_uint8(self, square_binary):
+        """Test the quantized grid matches the normalized one."""
+        binary = square_binary
+
+        grid = create_plot_grid(binary, grid_resolution=64)
+        quantized = create_plot_grid(binary, grid_resolution=64, dtype=np.uint8)
+
+        assert quantized.dtype == np.uint8
+        assert np.array_equal(quantized.astype(np.float32) / 255.0, grid)
+
 
 class TestDistanceFalloff:
     """Test distance falloff function."""
 
     def test_apply_distance_falloff(self):
         """Test distance-based falloff."""
-        from app.core.image_analysis.tracer import apply_distance_falloff
-
         # Create binary image with line
         binary = np.zeros((50, 50), dtype=np.uint8)
         binary[25, :] = 255  # Horizontal line
@@ -162,3 +193,29 @@ class TestDistanceFalloff:
         assert falloff[0, 0] == pytest.approx(0.0)
         # Adjacent pixels should have gradient
         assert 0.0 < falloff[24, 25] < 1.0
+
+
+class TestNonContiguousInput:
+    """Test entry points give the same result for strided views as for contiguous copies."""
+
+    @pytest.mark.parametrize("view", [
+        lambda a: a[:, ::-1],
+        lambda a: a[::2, ::2],
+        lambda a: a.T,
+        np.asfortranarray,
+    ])
+    @pytest.mark.parametrize("func", [
+        lambda img: threshold_image(img, method="otsu"),
+        lambda img: extract_plot_points(img),
+        lambda img: create_plot_grid(img, grid_resolution=16),
+        lambda img: apply_distance_falloff(img),
+    ])
+    def test_strided_view_matches_contiguous(self, view, func):
+        """Test a non-contiguous view matches its C-contiguous copy."""
+        rng = np.random.default_rng(0)
+        image = (rng.random((40, 52)) > 0.8).astype(np.uint8) * 255
+
+        strided = view(image)
+        contiguous = np.ascontiguousarray(strided)
+
+        assert np.array_equal(np.asarray(func(strided)), np.asarray(func(contiguous)))
@@ -3,14 +3,22 @@
 import pytest
 import numpy as np
 
+import app.core.geometry3d.vertex_mapper as vertex_mapper
+from app.core.geometry3d.vertex_mapper import (
+    apply_bilinear_interpolation,
+    apply_gaussian_smoothing,
+    compute_vertex_normals,
+    create_mesh_grid,
+    generate_relief_mesh,
+    map_pixels_to_vertices,
+)
+
 
 class TestCreateMeshGrid:
     """Test mesh grid creation."""
 
     def test_create_mesh_grid_default(self):
         """Test default mesh grid creation."""
-        from app.core.geometry3d.vertex_mapper import create_mesh_grid
-
         vertices, faces = create_mesh_grid(resolution=10)
 
         assert vertices.shape == (100, 3)  # 10x10 = 100 vertices
@@ -23,8 +31,6 @@ class TestCreateMeshGrid:
 
     def test_create_mesh_grid_custom_size(self):
         """Test custom mesh size."""
-        from app.core.geometry3d.vertex_mapper import create_mesh_grid
-
         vertices, faces = create_mesh_grid(resolution=5, size=4.0)
 
         assert vertices.shape == (25, 3)
@@ -38,11 +44,6 @@ class TestMapPixelsToVertices:
 
     def test_map_pixels_to_vertices_hit(self):
         """Test Z-displacement for hit pixels."""
-        from app.core.geometry3d.vertex_mapper import (
-            create_mesh_grid,
-            map_pixels_to_vertices,
-        )
-
         vertices, _ = create_mesh_grid(resolution=5)
 
         # Create displacement grid with center hit
@@ -60,11 +61,6 @@ class TestMapPixelsToVertices:
 
     def test_map_pixels_to_vertices_miss(self):
         """Test base height for miss pixels."""
-        from app.core.geometry3d.vertex_mapper import (
-            create_mesh_grid,
-            map_pixels_to_vertices,
-        )
-
         vertices, _ = create_mesh_grid(resolution=4)
         grid = np.zeros((4, 4), dtype=np.float32)  # All zeros
 
@@ -79,11 +75,6 @@ class TestSmoothing:
 
     def test_apply_gaussian_smoothing(self):
         """Test Gaussian smoothing reduces peaks."""
-        from app.core.geometry3d.vertex_mapper import (
-            create_mesh_grid,
-            apply_gaussian_smoothing,
-        )
-
         vertices, _ = create_mesh_grid(resolution=10)
 
         # Create spike in center
@@ -98,13 +89,20 @@ class TestSmoothing:
         neighbor_idx = 5 * 10 + 4
         assert smoothed[neighbor_idx, 2] > 0.0
 
+    def test_apply_gaussian_smoothing_inplace_any_layout(self):
+        """Test in-place smoothing updates the caller's array even when it is not C-ordered."""
+        vertices, _ = create_mesh_grid(resolution=10)
+        vertices[55, 2] = 10.0
+
+        expected = apply_gaussian_smoothing(vertices, resolution=10, sigma=1.0)
+        fortran = np.asfortranarray(vertices)
+        result = apply_gaussian_smoothing(fortran, resolution=10, sigma=1.0, inplace=True)
+
+        assert result is fortran
+        assert np.array_equal(fortran, expected)
+
     def test_apply_bilinear_interpolation(self):
         """Test bilinear interpolation smoothing."""
-        from app.core.geometry3d.vertex_mapper import (
-            create_mesh_grid,
-            apply_bilinear_interpolation,
-        )
-
         vertices, _ = create_mesh_grid(resolution=5)
 
         # Create spike
@@ -115,14 +113,35 @@ class TestSmoothing:
         # Peak should be reduced
         assert smoothed[12, 2] < 5.0
 
+    def test_bilinear_interpolation_numba_matches_numpy(self, monkeypatch):
+        """Test the Numba kernel matches the OpenCV fallback, border included."""
+        if not vertex_mapper.HAS_NUMBA:
+            pytest.skip("numba not installed")
+
+        vertices, _ = vertex_mapper.create_mesh_grid(resolution=16)
+        vertices[:, 2] = np.random.default_rng(0).random(len(vertices))
+
+        jit_smoothed = vertex_mapper.apply_bilinear_interpolation(
+            vertices, resolution=16, iterations=3
+        )
+        monkeypatch.setattr(vertex_mapper, "HAS_NUMBA", False)
+        numpy_smoothed = vertex_mapper.apply_bilinear_interpolation(
+            vertices, resolution=16, iterations=3
+        )
+
+        assert np.allclose(jit_smoothed, numpy_smoothed, rtol=0, atol=1e-12)
+
+        # Border vertices are never smoothed
+        border = np.ones((16, 16), dtype=bool)
+        border[1:-1, 1:-1] = False
+        assert np.array_equal(numpy_smoothed[border.ravel(), 2], vertices[border.ravel(), 2])
+
 
 class TestGenerateReliefMesh:
     """Test complete relief mesh generation."""
 
     def test_generate_relief_mesh_basic(self):
         """Test basic relief mesh generation."""
-        from app.core.geometry3d.vertex_mapper import generate_relief_mesh
-
         # Create simple displacement grid
         grid = np.zeros((50, 50), dtype=np.float32)
         grid[20:30, 20:30] = 1.0  # Square in center
@@ -143,8 +162,6 @@ class TestGenerateReliefMesh:
 
     def test_generate_relief_mesh_no_smoothing(self):
         """Test mesh with no smoothing."""
-        from app.core.geometry3d.vertex_mapper import generate_relief_mesh
-
         grid = np.zeros((10, 10), dtype=np.float32)
         grid[5, 5] = 1.0
 
@@ -156,17 +173,23 @@ class TestGenerateReliefMesh:
 
         assert result["vertices"].shape == (100, 3)
 
+    def test_generate_relief_mesh_arrays_are_writable(self):
+        """Test callers can modify every returned array without touching the cache."""
+        grid = np.zeros((10, 10), dtype=np.float32)
+
+        result = generate_relief_mesh(displacement_grid=grid, resolution=10)
+        for key in ("vertices", "faces", "normals"):
+            result[key][0] = 0
+
+        again = generate_relief_mesh(displacement_grid=grid, resolution=10)
+        assert again["faces"][0].tolist() != [0, 0, 0]
+
 
 class TestVertexNormals:
     """Test normal computation."""
 
     def test_compute_vertex_normals(self):
         """Test vertex normal computation."""
-        from app.core.geometry3d.vertex_mapper import (
-            create_mesh_grid,
-            compute_vertex_normals,
-        )
-
         vertices, faces = create_mesh_grid(resolution=3)
         normals = compute_vertex_normals(vertices, faces)
 
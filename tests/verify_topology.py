@@ -6,6 +6,8 @@ import cv2
 import numpy as np
 import os
 import sys
+import tempfile
+from functools import lru_cache
 
 # Add app to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -15,8 +17,9 @@ from app.core.topology.analyzer import TopologyAnalyzer
 from app.core.geometry3d.mapping import map_image_to_3d
 
 
+@lru_cache(maxsize=None)
 def create_synthetic_image(type_name: str, size: int = 128) -> np.ndarray:
-    """Create synthetic test images."""
+    """Create synthetic test images (cached and read-only; copy before drawing)."""
     img = np.zeros((size, size), dtype=np.uint8)
     center = (size // 2, size // 2)
 
@@ -38,6 +41,7 @@ def create_synthetic_image(type_name: str, size: int = 128) -> np.ndarray:
         rng = np.random.default_rng(42)
         img = rng.integers(0, 255, (size, size), dtype=np.uint8)
 
+    img.flags.writeable = False
     return img
 
 
@@ -46,15 +50,16 @@ def test_analysis():
     analyzer = TopologyAnalyzer()
 
     # 1. Toroid Check
+    # Extract features once so a failure can dump them without re-analysis
+    # (the image already spans 0-255, so analyze()'s normalization is a no-op)
     circle_img = create_synthetic_image("circle")
-    cv2.imwrite("temp_circle.png", circle_img)
-    family, conf = analyzer.analyze("temp_circle.png")
+    features = analyzer._extract_features(circle_img)  # HACK: Access protected method
+    family, conf = analyzer.classify(features)
     print(f"Circle Image -> {family} (Confidence: {conf})")
 
     # DEBUG: Inspect features manually if needed
     if family != TopologyFamily.TOROIDAL:
         print("DEBUG: Circle Classification Failed. Dumping Features:")
-        features = analyzer._extract_features(circle_img)  # HACK: Access protected method
         print(f"Symmetry: {features.get('symmetry')}")
         print(f"Radial: {features.get('radial')}")
         print(f"Concentric: {features.get('concentric_circles')}")
@@ -65,15 +70,13 @@ def test_analysis():
 
     # 2. Lattice Check
     grid_img = create_synthetic_image("grid")
-    cv2.imwrite("temp_grid.png", grid_img)
-    family, conf = analyzer.analyze("temp_grid.png")
+    family, conf = analyzer.analyze(grid_img)
     print(f"Grid Image -> {family} (Confidence: {conf})")
     assert family == TopologyFamily.LATTICE_RESONATOR, f"Grid should be Lattice, got {family}"
 
     # 3. Planar/Helical Check (Stripes often ambiguous but definitely not Toroid)
     stripes_img = create_synthetic_image("stripes")
-    cv2.imwrite("temp_stripes.png", stripes_img)
-    family, conf = analyzer.analyze("temp_stripes.png")
+    family, conf = analyzer.analyze(stripes_img)
     print(f"Stripes Image -> {family} (Confidence: {conf})")
     # Stripes usually mapped to Helical (linear periodicity) or Planar
     assert family in [TopologyFamily.HELICAL, TopologyFamily.PLANAR_RELIEF], (
@@ -84,9 +87,13 @@ def test_analysis():
 def test_generation():
     print("\nTesting Generation...")
 
-    # Force Toroid
+    # Force Toroid (map_image_to_3d reads from a path, so this is the one
+    # image that goes through the filesystem)
     steering = {"force_family": "toroidal"}
-    result = map_image_to_3d("temp_circle.png", steering=steering)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        circle_path = os.path.join(tmp_dir, "circle.png")
+        cv2.imwrite(circle_path, create_synthetic_image("circle"))
+        result = map_image_to_3d(circle_path, steering=steering)
     verts = result["vertices"]
     print(f"Generated Toroid Vertices: {len(verts)}")
     assert result["topology_family"] == TopologyFamily.TOROIDAL
@@ -103,10 +110,9 @@ def test_negative_klein():
 
     # Create ambiguous image
     img = create_synthetic_image("noise")
-    cv2.imwrite("temp_noise.png", img)
 
     steering = SteeringProfile(orientation_rule=OrientationRule.PRESERVE)
-    family, conf = analyzer.analyze("temp_noise.png", steering)
+    family, conf = analyzer.analyze(img, steering)
 
     print(f"Noise Image + Preserve Orientation -> {family}")
     assert family != TopologyFamily.KLEIN_BOTTLE, "Should never auto-detect Klein Bottle"
@@ -124,13 +130,3 @@ if __name__ == "__main__":
 
         traceback.print_exc()
         sys.exit(1)
-    finally:
-        # Cleanup
-        if os.path.exists("temp_circle.png"):
-            os.remove("temp_circle.png")
-        if os.path.exists("temp_grid.png"):
-            os.remove("temp_grid.png")
-        if os.path.exists("temp_stripes.png"):
-            os.remove("temp_stripes.png")
-        if os.path.exists("temp_noise.png"):
-            os.remove("temp_noise.png")